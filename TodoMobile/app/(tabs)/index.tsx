@@ -6,7 +6,7 @@ import { useTodo } from '../contexts/TodoContext';
 import { Todo } from '../types';
 
 export default function TodoListScreen() {
-  const { todos, loading, error, fetchTodos, updateTodo, deleteTodo } = useTodo();
+  const { todos, loading, error, fetchTodos, fetchMoreTodos, syncTodos, updateTodo, deleteTodo } = useTodo();
   const [refreshing, setRefreshing] = useState(false);
   const [snackbarVisible, setSnackbarVisible] = useState(false);
   const [operationLoading, setOperationLoading] = useState(false);
@@ -49,7 +49,8 @@ export default function TodoListScreen() {
 
   const onRefresh = async () => {
     setRefreshing(true);
-    await fetchTodos();
+    await syncTodos();
+    setRefreshing(false);
   };
 
   const renderTodo = ({ item }: { item: Todo }) => (
@@ -120,6 +121,8 @@ export default function TodoListScreen() {
         renderItem={renderTodo}
         keyExtractor={item => item.id.toString()}
         contentContainerStyle={styles.listContent}
+        onEndReached={fetchMoreTodos}
+        onEndReachedThreshold={0.5}
         refreshControl={
           <RefreshControl
             refreshing={refreshing}
@@ -1,4 +1,5 @@
-import React, { createContext, useContext, useState, ReactNode } from 'react';
+import React, { createContext, useContext, useState, useRef, ReactNode } from 'react';
+import axios from 'axios';
 import { Todo } from '../types';
 import { todoService } from '../services/api';
 
@@ -6,7 +7,10 @@ interface TodoContextType {
   todos: Todo[];
   loading: boolean;
   error: string;
+  hasMore: boolean;
   fetchTodos: () => Promise<void>;
+  fetchMoreTodos: () => Promise<void>;
+  syncTodos: () => Promise<void>;
   createTodo: (todo: Omit<Todo, 'id'>) => Promise<void>;
   updateTodo: (id: number, todo: Partial<Todo>) => Promise<void>;
   deleteTodo: (id: number) => Promise<void>;
@@ -14,16 +18,28 @@ interface TodoContextType {
 
 const TodoContext = createContext<TodoContextType | undefined>(undefined);
 
+// The list's order, as the API pages it: newest first, then highest id.
+const newestFirst = (a: Todo, b: Todo) =>
+  Date.parse(b.created_at) - Date.parse(a.created_at) || b.id - a.id;
+
 export function TodoProvider({ children }: { children: ReactNode }) {
   const [todos, setTodos] = useState<Todo[]>([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
+  const [nextUrl, setNextUrl] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const syncToken = useRef<string | null>(null);
 
   const fetchTodos = async () => {
     try {
       setLoading(true);
-      const data = await todoService.getTodos();
-      setTodos(data);
+      // Take the sync token before reading the list so nothing changed in
+      // between can be missed by the next delta sync.
+      const { token } = await todoService.syncTodos();
+      const page = await todoService.getTodos();
+      syncToken.current = token;
+      setTodos(page.results);
+      setNextUrl(page.next);
       setError('');
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to fetch todos';
@@ -33,10 +49,67 @@ export function TodoProvider({ children }: { children: ReactNode }) {
     }
   };
 
+  const fetchMoreTodos = async () => {
+    if (!nextUrl || loadingMore) return;
+    try {
+      setLoadingMore(true);
+      const page = await todoService.getTodos(nextUrl);
+      // A delta sync may already have brought in some of this page.
+      setTodos(prevTodos => {
+        const known = new Set(prevTodos.map(t => t.id));
+        return [...prevTodos, ...page.results.filter(t => !known.has(t.id))];
+      });
+      setNextUrl(page.next);
+      setError('');
+    } catch (err) {
+      const errorMessage = err instanceof Error ? err.message : 'Failed to fetch todos';
+      setError(errorMessage);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const syncTodos = async () => {
+    if (!syncToken.current) {
+      return fetchTodos();
+    }
+    try {
+      let hasMore = true;
+      while (hasMore) {
+        const delta = await todoService.syncTodos(syncToken.current);
+        const changed = new Map(delta.changes.map(t => [t.id, t]));
+        const deleted = new Set(delta.deleted);
+        setTodos(prevTodos => {
+          const known = new Set(prevTodos.map(t => t.id));
+          const kept = prevTodos
+            .filter(t => !deleted.has(t.id))
+            .map(t => changed.get(t.id) ?? t);
+          // Unknown todos that sort below the oldest loaded one sit on pages
+          // not fetched yet; fetchMoreTodos will load them in place.
+          const oldest = prevTodos[prevTodos.length - 1];
+          const added = delta.changes.filter(t =>
+            !known.has(t.id) && (!nextUrl || !oldest || newestFirst(t, oldest) < 0));
+          return added.length ? [...added, ...kept].sort(newestFirst) : kept;
+        });
+        syncToken.current = delta.token;
+        hasMore = delta.has_more;
+      }
+      setError('');
+    } catch (err) {
+      if (axios.isAxiosError(err) && err.response?.status === 410) {
+        // Token is older than the server keeps tombstones for.
+        syncToken.current = null;
+        return fetchTodos();
+      }
+      const errorMessage = err instanceof Error ? err.message : 'Failed to sync todos';
+      setError(errorMessage);
+    }
+  };
+
   const createTodo = async (todo: Omit<Todo, 'id'>) => {
     try {
       const newTodo = await todoService.createTodo(todo);
-      setTodos(prevTodos => [...prevTodos, newTodo]);
+      setTodos(prevTodos => [newTodo, ...prevTodos]);
       setError('');
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to create todo';
@@ -70,7 +143,7 @@ export function TodoProvider({ children }: { children: ReactNode }) {
   };
 
   return (
-    <TodoContext.Provider value={{ todos, loading, error, fetchTodos, createTodo, updateTodo, deleteTodo }}>
+    <TodoContext.Provider value={{ todos, loading, error, hasMore: nextUrl !== null, fetchTodos, fetchMoreTodos, syncTodos, createTodo, updateTodo, deleteTodo }}>
       {children}
     </TodoContext.Provider>
   );
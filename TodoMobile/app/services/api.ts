@@ -1,6 +1,6 @@
 import axios from 'axios';
 import AsyncStorage from '@react-native-async-storage/async-storage';
-import { Todo, User, AuthResponse } from '../types';
+import { Todo, User, AuthResponse, PaginatedResponse, SyncResponse, BulkOperation, BulkResult } from '../types';
 import { Platform } from 'react-native';
 
 const API_URL = 'https://todo.dhruvchheda.com/api';
@@ -202,9 +202,10 @@ export const authService = {
 };
 
 export const todoService = {
-  getTodos: async (): Promise<Todo[]> => {
+  getTodos: async (cursorUrl?: string | null): Promise<PaginatedResponse<Todo>> => {
     try {
-      const response = await api.get('/todos/');
+      // `next` links from the server are absolute URLs and already carry the cursor.
+      const response = await api.get<PaginatedResponse<Todo>>(cursorUrl || '/todos/');
       return response.data;
     } catch (error) {
       console.error('Error fetching todos:', error);
@@ -212,6 +213,25 @@ export const todoService = {
     }
   },
 
+  syncTodos: async (since?: string | null): Promise<SyncResponse> => {
+    // Without `since` the server only hands back a token for "now"; with it,
+    // only the todos changed or deleted after that token are returned.
+    const response = await api.get<SyncResponse>('/todos/sync/', {
+      params: since ? { since } : undefined,
+    });
+    return response.data;
+  },
+
+  bulkTodos: async (operations: BulkOperation[]): Promise<BulkResult[]> => {
+    try {
+      const response = await api.post<{ results: BulkResult[] }>('/todos/bulk/', { operations });
+      return response.data.results;
+    } catch (error) {
+      console.error('Error applying bulk operations:', error);
+      throw new Error('Failed to apply changes. Please try again.');
+    }
+  },
+
   getTodo: async (id: number): Promise<Todo> => {
     try {
       const response = await api.get<Todo>(`/todos/${id}/`);
@@ -7,6 +7,31 @@ export interface Todo {
   user: number;
 }
 
+export interface PaginatedResponse<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+export interface SyncResponse {
+  changes: Todo[];
+  deleted: number[];
+  token: string;
+  has_more: boolean;
+}
+
+export type BulkOperation =
+  | { op: 'create'; data: Partial<Todo> }
+  | { op: 'update'; id: number; data: Partial<Todo> }
+  | { op: 'delete' | 'toggle'; id: number };
+
+export interface BulkResult {
+  id: number | null;
+  status: number;
+  data?: Todo;
+  errors?: Record<string, string[]>;
+}
+
 export interface User {
   id: number;
   username: string;
@@ -1,13 +1,74 @@
-import multiprocessing
+import gc
+import os
+import shutil
+import sys
+
+# gunicorn only puts the project on sys.path after reading this file.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from todoproject import cgroups  # noqa: E402
+
+# Workers write metrics samples here and /metrics merges them; must be set
+# before the app (and prometheus_client) is loaded.
+metrics_dir = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/todoproject-metrics')
+
+# Objects freed while the app is preloaded leave holes in pages every worker
+# would then copy; no collections in the master until the workers fork
+# (see pre_fork/post_fork below).
+gc.disable()
 
 # Server socket
 bind = "0.0.0.0:8000"
 backlog = 2048
 
-# Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = 'sync'
-worker_connections = 1000
+# Worker model:
+# - 'sync': one request at a time per process. CPU-bound work, simplest.
+# - 'gthread': GUNICORN_THREADS requests per process on threads, so fewer,
+#   shared-memory processes cover the same concurrency; good for I/O waits
+#   on the database. Each thread holds its own database connection.
+# - 'asgi': todoproject.asgi on uvicorn workers with the async todo API, so
+#   one worker can hold many slow mobile connections.
+worker_model = os.getenv('GUNICORN_WORKER_MODEL', 'sync')
+# Roughly the RSS of one worker after warm-up; caps the worker count so the
+# container's memory limit isn't hit.
+worker_memory_mb = int(os.getenv('GUNICORN_WORKER_MEMORY_MB', '150'))
+
+
+def worker_count(model, cpus, memory_limit, worker_memory_mb):
+    """Workers for ``cpus`` CPUs within ``memory_limit`` bytes (None: no limit)."""
+    if model == 'sync':
+        count = cpus * 2 + 1
+    elif model == 'gthread':
+        count = cpus + 1
+    else:
+        # An event loop keeps its CPU busy on its own.
+        count = cpus
+    if memory_limit is not None:
+        # Leave a quarter of the limit for the master, page cache and spikes.
+        count = min(count, int(memory_limit * 0.75) // (worker_memory_mb * 1024 * 1024))
+    return max(count, 1)
+
+
+# Worker processes: sized from the container's CPU quota and memory limit,
+# not the host's CPU count. GUNICORN_WORKERS overrides.
+workers = int(os.getenv('GUNICORN_WORKERS') or worker_count(
+    worker_model, cgroups.available_cpus(), cgroups.memory_limit(), worker_memory_mb))
+if worker_model == 'asgi':
+    wsgi_app = 'todoproject.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    os.environ.setdefault('ASYNC_API', 'True')
+elif worker_model == 'gthread':
+    wsgi_app = 'todoproject.wsgi:application'
+    worker_class = 'gthread'
+    # Only set here: threads > 1 silently turns sync workers into gthread.
+    threads = int(os.getenv('GUNICORN_THREADS', '4'))
+    # Open connections per worker, idle keep-alives included.
+    worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '1000'))
+elif worker_model == 'sync':
+    wsgi_app = 'todoproject.wsgi:application'
+    worker_class = 'sync'
+else:
+    raise RuntimeError(f'GUNICORN_WORKER_MODEL must be sync, gthread or asgi, not {worker_model!r}')
+
 timeout = 30
 keepalive = 2
 graceful_timeout = 30
@@ -36,4 +97,38 @@ keyfile = None
 certfile = None
 
 # Preload app
-preload_app = True 
\ No newline at end of file
+preload_app = True 
+
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be merged into this one.
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    # The app is preloaded; do its first-request work once here so forked
+    # and recycled workers start warm.
+    from todoproject.warmup import warm
+    server.log.info('Warmed the app in %.0f ms', warm() * 1000)
+
+
+def pre_fork(server, worker):
+    # With preload_app the master has run Django; a connection it opened
+    # would be shared by every forked worker.
+    from django.db import connections
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+    # Move everything loaded so far to the permanent generation: the
+    # workers' collections then never write to those objects' headers, and
+    # the preloaded pages stay shared copy-on-write.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    gc.enable()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Todo
+from .models import Task, Todo
 
 # Register your models here.
 admin.site.register(Todo)
+admin.site.register(Task)
@@ -0,0 +1,227 @@
+"""
+Async versions of the todo API endpoints, used when the app is served over
+ASGI (``ASYNC_API=True``, set by ``GUNICORN_WORKER_MODEL=asgi``).
+
+DRF views are sync-only, so these are plain Django async views that reuse the
+DRF serializers, JWT validation and pagination but talk to the database through
+Django's async ORM. Responses match the sync views byte for byte.
+"""
+import logging
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .. import cache as todo_cache, search, versioning
+from .authentication import StatelessJWTAuthentication
+from ..models import Todo, TodoVersion
+from .renderers import ORJSONRenderer
+from .pagination import TodoCursorPagination, TodoSearchPagination
+from .serializers import TodoSerializer
+from . import filters, sync, views
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+class AsyncAPIView(View):
+    """Minimal async counterpart of DRF's APIView: JWT auth and JSON in/out."""
+    authentication = StatelessJWTAuthentication() if settings.JWT_STATELESS_AUTH else JWTAuthentication()
+    renderer = ORJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token-authenticated like the DRF views, so no CSRF check.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+        if request.method.lower() not in self.http_method_names or handler is None:
+            return self.render({'detail': f'Method "{request.method}" not allowed.'},
+                               status.HTTP_405_METHOD_NOT_ALLOWED)
+        try:
+            request.user = await self.authenticate(request)
+            return await handler(request, *args, **kwargs)
+        except APIException as e:
+            # Same body shapes as DRF's exception handler.
+            detail = e.detail if isinstance(e.detail, (dict, list)) else {'detail': e.detail}
+            response = self.render(detail, e.status_code)
+            if e.status_code == status.HTTP_401_UNAUTHORIZED:
+                response['WWW-Authenticate'] = self.authentication.authenticate_header(request)
+            return response
+
+    async def authenticate(self, request):
+        header = self.authentication.get_header(request)
+        raw_token = self.authentication.get_raw_token(header) if header else None
+        if raw_token is None:
+            raise AuthenticationFailed('Authentication credentials were not provided.', code='not_authenticated')
+        token = self.authentication.get_validated_token(raw_token)
+        if isinstance(self.authentication, StatelessJWTAuthentication):
+            return await self.authentication.aget_user(token)
+        try:
+            user_id = token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+        try:
+            user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        content = self.renderer.render(data) if data is not None else b''
+        return HttpResponse(content, status=status_code, content_type='application/json')
+
+    def parse(self, request):
+        if not request.body:
+            return {}
+        data = orjson.loads(request.body)
+        if not isinstance(data, dict):
+            raise ValueError('Expected a JSON object')
+        return data
+
+    async def conditional(self, request):
+        """Return ``(etag, response)``; response is a 304/412 or None."""
+        version = await TodoVersion.acurrent(request.user.pk)
+        etag = versioning.request_etag(request, version=version)
+        return etag, versioning.check_preconditions(request, etag)
+
+    def has_preconditions(self, request):
+        return 'HTTP_IF_MATCH' in request.META or 'HTTP_IF_NONE_MATCH' in request.META
+
+
+class TodoListView(AsyncAPIView):
+    async def get(self, request):
+        version = await TodoVersion.acurrent(request.user.pk)
+        etag = versioning.request_etag(request, version=version)
+        not_modified = versioning.check_preconditions(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        if not request.GET:
+            # Trusted only at the current version; see views.TodoListView.
+            cached = await sync_to_async(todo_cache.get_first_page)(request.user.pk)
+            if cached and cached[0] == version:
+                return versioning.set_etag(self.render(cached[1]), etag)
+
+        q = search.clean_query(request.GET.get('q'))
+        queryset, ordering = filters.filter_todos(Todo.objects.filter(user=request.user), request.GET, search=bool(q))
+        if q:
+            paginator = TodoSearchPagination()
+            queryset = paginator.prepare_queryset(search.search(queryset, q), Request(request))
+        else:
+            paginator = TodoCursorPagination()
+            queryset = paginator.prepare_queryset(queryset, Request(request), ordering)[:paginator.page_size + 1]
+        if ordering[0].lstrip('-') in TodoSerializer.Meta.fields:
+            page = TodoSerializer.localize(paginator.set_page([row async for row in TodoSerializer.values(queryset)]))
+        else:
+            page = TodoSerializer(paginator.set_page([todo async for todo in queryset]), many=True).data
+        data = paginator.get_paginated_response(page).data
+        if not request.GET:
+            await sync_to_async(todo_cache.set_first_page)(request.user.pk, version, data)
+        return versioning.set_etag(self.render(data), etag)
+
+    async def post(self, request):
+        try:
+            data = self.parse(request)
+        except ValueError as e:
+            return self.render({'detail': f'JSON parse error - {e}'}, status.HTTP_400_BAD_REQUEST)
+        serializer = TodoSerializer(data=data)
+        if not serializer.is_valid():
+            return self.render(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        todo = await Todo.objects.acreate(user=request.user, **serializer.validated_data)
+        return self.render(TodoSerializer(todo).data, status.HTTP_201_CREATED)
+
+
+class TodoDetailView(AsyncAPIView):
+    # Writes carrying If-Match need a row lock held across check and write,
+    # which the async ORM can't do; those go through the sync view.
+    locked_write_view = staticmethod(sync_to_async(views.TodoDetailView.as_view()))
+
+    async def get_object(self, request, pk):
+        try:
+            return await Todo.objects.filter(user=request.user).aget(pk=pk)
+        except Todo.DoesNotExist:
+            return None
+
+    async def get(self, request, pk):
+        etag, not_modified = await self.conditional(request)
+        if not_modified is not None:
+            return not_modified
+        todo = await self.get_object(request, pk)
+        if todo is None:
+            return self.render({'detail': 'Not found.'}, status.HTTP_404_NOT_FOUND)
+        return versioning.set_etag(self.render(TodoSerializer(todo).data), etag)
+
+    async def patch(self, request, pk):
+        if self.has_preconditions(request):
+            return await self.locked_write_view(request, pk=pk)
+        todo = await self.get_object(request, pk)
+        if todo is None:
+            return self.render({'detail': 'Not found.'}, status.HTTP_404_NOT_FOUND)
+        try:
+            data = self.parse(request)
+        except ValueError as e:
+            return self.render({'detail': f'JSON parse error - {e}'}, status.HTTP_400_BAD_REQUEST)
+        serializer = TodoSerializer(todo, data=data, partial=True)
+        if not serializer.is_valid():
+            return self.render(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        changed = todo.assign(serializer.validated_data)
+        if changed:
+            await todo.asave(update_fields=[*changed, 'updated_at'])
+        return self.render(TodoSerializer(todo).data)
+
+    # The sync view treats PUT as a partial update as well.
+    put = patch
+
+    async def delete(self, request, pk):
+        if self.has_preconditions(request):
+            return await self.locked_write_view(request, pk=pk)
+        todo = await self.get_object(request, pk)
+        if todo is None:
+            return self.render({'detail': 'Not found.'}, status.HTTP_404_NOT_FOUND)
+        await todo.asoft_delete()
+        return self.render(None, status.HTTP_204_NO_CONTENT)
+
+
+class TodoToggleView(AsyncAPIView):
+    async def post(self, request, pk):
+        # One thread hop for the UPDATE and the (sync) version bump after it.
+        todo = await sync_to_async(Todo.toggle)(request.user.pk, pk)
+        if todo is None:
+            logger.warning(f"Todo {pk} not found")
+            return self.render({'error': 'Todo not found'}, status.HTTP_404_NOT_FOUND)
+        return self.render(TodoSerializer(todo).data)
+
+
+class TodoSyncView(AsyncAPIView):
+    async def get(self, request):
+        since = request.GET.get('since')
+        if not since:
+            token = await sync_to_async(sync.current_token)(request.user)
+            return self.render({'changes': [], 'deleted': [], 'token': token, 'has_more': False})
+        try:
+            changed, deleted_ids, token, has_more = await sync_to_async(sync.changes_since)(
+                request.user, since, views.TodoSyncView.limit
+            )
+        except sync.InvalidSyncToken as e:
+            return self.render({'error': str(e)}, status.HTTP_400_BAD_REQUEST)
+        except sync.ExpiredSyncToken as e:
+            return self.render({'error': str(e)}, status.HTTP_410_GONE)
+        return self.render({
+            'changes': TodoSerializer(changed, many=True).data,
+            'deleted': deleted_ids,
+            'token': token,
+            'has_more': has_more,
+        })
@@ -0,0 +1,86 @@
+"""
+Stateless JWT authentication (``JWT_STATELESS_AUTH=True``).
+
+simplejwt's ``JWTAuthentication`` loads the user row on every request. Here
+the signed ``user_id`` claim is trusted and only the fields authorization
+needs (active, staff, superuser) are read, from a short-lived cache entry per
+user. Deactivating or deleting a user clears the entry in this process;
+other processes pick the change up within ``JWT_USER_STATE_TTL`` seconds.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+User = get_user_model()
+
+STATE_FIELDS = ('username', 'is_active', 'is_staff', 'is_superuser')
+_MISSING = object()
+
+
+def state_key(user_id):
+    return f'auth:user-state:{user_id}'
+
+
+def forget_user(user_id):
+    """Drop the cached state so the next request re-reads the user row."""
+    cache.delete(state_key(user_id))
+
+
+def build_user(user_id, state):
+    """
+    A ``User`` holding only the id and ``STATE_FIELDS``; every other field is
+    deferred, so it can be used in filters and foreign keys without a query
+    and is loaded on first access if a view needs it.
+    """
+    loaded = dict(zip((jwt_settings.USER_ID_FIELD, *STATE_FIELDS), (user_id, *state)))
+    # from_db expects values in concrete field order.
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in loaded]
+    return User.from_db(DEFAULT_DB_ALIAS, names, [loaded[name] for name in names])
+
+
+def user_state(user_id):
+    state = cache.get(state_key(user_id), _MISSING)
+    if state is _MISSING:
+        state = User.objects.filter(
+            **{jwt_settings.USER_ID_FIELD: user_id}).values_list(*STATE_FIELDS).first()
+        cache.set(state_key(user_id), state, settings.JWT_USER_STATE_TTL)
+    return state
+
+
+async def auser_state(user_id):
+    state = await cache.aget(state_key(user_id), _MISSING)
+    if state is _MISSING:
+        state = await User.objects.filter(
+            **{jwt_settings.USER_ID_FIELD: user_id}).values_list(*STATE_FIELDS).afirst()
+        await cache.aset(state_key(user_id), state, settings.JWT_USER_STATE_TTL)
+    return state
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that builds the user from the token and cached state."""
+
+    def user_id(self, validated_token):
+        try:
+            return validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+
+    def check_state(self, user_id, state):
+        if state is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        user = build_user(user_id, state)
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
+
+    def get_user(self, validated_token):
+        user_id = self.user_id(validated_token)
+        return self.check_state(user_id, user_state(user_id))
+
+    async def aget_user(self, validated_token):
+        user_id = self.user_id(validated_token)
+        return self.check_state(user_id, await auser_state(user_id))
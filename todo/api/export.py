@@ -0,0 +1,69 @@
+"""
+Streaming export of a user's todos as NDJSON or CSV.
+
+Rows come from ``values().iterator(chunk_size=...)``, which uses a server-side
+cursor on PostgreSQL, and are encoded a chunk at a time. Memory stays flat no
+matter how many todos the user has. Fields and formatting match the API's
+todo representation, so an export can be fed back through the import
+endpoint.
+"""
+import csv
+import io
+from itertools import islice
+import orjson
+from ..models import Todo
+from .renderers import OPTIONS
+from .serializers import TodoSerializer
+
+CHUNK_SIZE = 2000
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+def rows(user, chunk_size=CHUNK_SIZE):
+    """The user's todos, oldest first, as lists of at most ``chunk_size`` dicts."""
+    queryset = TodoSerializer.values(Todo.objects.filter(user=user).order_by('created_at', 'id'))
+    iterator = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield TodoSerializer.localize(chunk)
+
+
+def isoformat(value):
+    """Datetimes the way the API renders them."""
+    value = value.isoformat()
+    return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+
+def encode_ndjson(chunks):
+    for chunk in chunks:
+        yield b''.join(orjson.dumps(row, option=OPTIONS) + b'\n' for row in chunk)
+
+
+def encode_csv(chunks):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow(TodoSerializer.Meta.fields)
+    yield flush()
+    for chunk in chunks:
+        writer.writerows(
+            (row['id'], row['title'], row['description'], 'true' if row['completed'] else 'false',
+             isoformat(row['created_at']))
+            for row in chunk
+        )
+        yield flush()
+
+
+ENCODERS = {'ndjson': encode_ndjson, 'csv': encode_csv}
+
+
+def stream(user, format):
+    return ENCODERS[format](rows(user))
@@ -0,0 +1,84 @@
+"""
+Query-parameter filters for the todo list endpoint.
+
+Only combinations an index can answer in order are accepted, so no request
+makes the database sort a user's whole list:
+
+* ``ordering=created_at`` / ``-created_at`` (default), optionally with
+  ``completed`` and ``created_before`` / ``created_after``: a range scan on
+  ``todo_user_created_idx`` or its completed/open partial twins.
+* ``ordering=updated_at`` / ``-updated_at`` on its own: ``todo_user_updated_idx``.
+  ``completed`` or a created_at range would force a sort or a full scan, so
+  they are rejected.
+
+Search (``q``) ranks its results itself, so it takes no ``ordering``.
+"""
+from datetime import datetime, time
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+ORDERINGS = {
+    '-created_at': ('-created_at', '-id'),
+    'created_at': ('created_at', 'id'),
+    '-updated_at': ('-updated_at', '-id'),
+    'updated_at': ('updated_at', 'id'),
+}
+DEFAULT_ORDERING = ORDERINGS['-created_at']
+BOOLEANS = {'true': True, '1': True, 'false': False, '0': False}
+
+
+def parse_boolean(name, value):
+    try:
+        return BOOLEANS[value.lower()]
+    except KeyError:
+        raise ValidationError({name: ['Must be true or false.']})
+
+
+def parse_timestamp(name, value):
+    """An ISO 8601 datetime, or a date meaning midnight in the current timezone."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({name: ['Must be an ISO 8601 date or datetime.']})
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_todos(queryset, params, search=False):
+    """
+    Apply ``completed``, ``created_before``, ``created_after`` and
+    ``ordering`` from ``params`` to ``queryset``. Returns the filtered queryset
+    and the ordering the paginator should use; raises ValidationError (400)
+    for bad values and for combinations no index serves.
+    """
+    filtered = []
+    if 'completed' in params:
+        queryset = queryset.filter(completed=parse_boolean('completed', params['completed']))
+        filtered.append('completed')
+    if 'created_after' in params:
+        queryset = queryset.filter(created_at__gt=parse_timestamp('created_after', params['created_after']))
+        filtered.append('created_after')
+    if 'created_before' in params:
+        queryset = queryset.filter(created_at__lt=parse_timestamp('created_before', params['created_before']))
+        filtered.append('created_before')
+
+    if 'ordering' not in params:
+        return queryset, DEFAULT_ORDERING
+    if search:
+        raise ValidationError({'ordering': ['Search results are ordered by relevance.']})
+    try:
+        ordering = ORDERINGS[params['ordering']]
+    except KeyError:
+        raise ValidationError({'ordering': [f"Must be one of: {', '.join(ORDERINGS)}."]})
+    if ordering[0].lstrip('-') == 'updated_at' and filtered:
+        raise ValidationError({'ordering': [
+            f"ordering={params['ordering']} can't be combined with {', '.join(filtered)}."
+        ]})
+    return queryset, ordering
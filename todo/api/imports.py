@@ -0,0 +1,118 @@
+"""
+Streaming import of todos from NDJSON or CSV (the formats export.py writes).
+
+The upload is read a line at a time and handled in batches of ``BATCH_SIZE``
+rows. Each row is validated with TodoSerializer's rules. Valid rows are
+written with COPY or batched INSERTs (see todo.bulkload), one transaction per
+batch, so neither memory nor transaction size grows with the file. Bad rows
+are skipped and reported with their line number; the rest of the file is
+still imported.
+"""
+import codecs
+import csv
+from itertools import islice
+import orjson
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+from ..bulkload import write_rows
+from ..models import Todo
+from ..signals import todos_changed
+from .serializers import TodoSerializer
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+FORMATS = ('ndjson', 'csv')
+COLUMNS = ('title', 'description', 'completed', 'created_at', 'updated_at', 'sync_seq', 'user_id')
+
+
+class TodoImportSerializer(TodoSerializer):
+    """TodoSerializer that also accepts created_at, so exports round-trip."""
+    created_at = serializers.DateTimeField(required=False)
+
+    class Meta(TodoSerializer.Meta):
+        read_only_fields = ()
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def error(self, line, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {'created': self.created, 'failed': self.failed, 'errors': self.errors}
+
+
+def ndjson_rows(stream):
+    """Yield ``(line_number, row_or_None, error_or_None)`` for an NDJSON byte stream."""
+    for number, line in enumerate(iter(stream.readline, b''), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            yield number, None, {'non_field_errors': [f'Invalid JSON: {e}']}
+            continue
+        if not isinstance(row, dict):
+            yield number, None, {'non_field_errors': ['Expected a JSON object.']}
+            continue
+        yield number, row, None
+
+
+def csv_rows(stream):
+    """Same for CSV with a header row; quoted fields may span lines."""
+    reader = csv.DictReader(codecs.iterdecode(iter(stream.readline, b''), 'utf-8-sig'))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except (csv.Error, UnicodeDecodeError) as e:
+            yield reader.line_num, None, {'non_field_errors': [f'Invalid CSV: {e}']}
+            if isinstance(e, UnicodeDecodeError):
+                return
+            continue
+        # Blank or missing cells mean "not given", so defaults apply as they
+        # would for a missing JSON key.
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in ('', None)}, None
+
+
+PARSERS = {'ndjson': ndjson_rows, 'csv': csv_rows}
+
+
+def import_todos(user, stream, format, batch_size=BATCH_SIZE):
+    """Import every row of ``stream`` as a todo owned by ``user``; returns an ImportReport."""
+    report = ImportReport()
+    validator = TodoImportSerializer()
+    rows = PARSERS[format](stream)
+    while batch := list(islice(rows, batch_size)):
+        valid = []
+        for line, data, error in batch:
+            if error is None:
+                try:
+                    data = validator.run_validation(data)
+                except serializers.ValidationError as e:
+                    error = e.detail
+            if error is not None:
+                report.error(line, error)
+                continue
+            valid.append(data)
+        if valid:
+            with transaction.atomic():
+                # Take the sequence number (and the version row lock) before
+                # stamping, so delta sync sees the batch in commit order.
+                sync_seq = todos_changed(user.pk)
+                now = timezone.now()
+                write_rows(Todo._meta.db_table, COLUMNS, (
+                    (data['title'], data.get('description', ''), data.get('completed', False),
+                     data.get('created_at', now), now, sync_seq, user.pk)
+                    for data in valid
+                ))
+            report.created += len(valid)
+    return report
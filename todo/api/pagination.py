@@ -0,0 +1,204 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination, Cursor
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class TodoCursorPagination(CursorPagination):
+    """
+    Keyset pagination over ``(created_at, id)``, or ``(updated_at, id)`` when
+    the view asks for that ordering (see filters.ORDERINGS).
+
+    DRF's CursorPagination only seeks on the first ordering field and falls
+    back to OFFSET for ties. Here the position is the full ``(timestamp, id)``
+    pair, which is unique, so every page is a single index range scan and the
+    cost of page 500 is the same as page 1.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    position_separator = '|'
+
+    @staticmethod
+    def seek(queryset, value, pk, reverse=False, ordering=ordering):
+        """Filter to the rows strictly after ``(value, pk)`` in page order."""
+        field = ordering[0].lstrip('-')
+        # Walking towards older rows, or back up an ascending list.
+        older = ordering[0].startswith('-') != reverse
+        # The leading inclusive bound gives the planner an index range to
+        # start from; the OR only settles ties within one timestamp.
+        if older:
+            return queryset.filter(
+                Q(**{f'{field}__lte': value}) & (Q(**{f'{field}__lt': value}) | Q(id__lt=pk))
+            )
+        return queryset.filter(
+            Q(**{f'{field}__gte': value}) & (Q(**{f'{field}__gt': value}) | Q(id__gt=pk))
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare_queryset(queryset, request, getattr(view, 'ordering', None))
+        if queryset is None:
+            return None
+        # Fetch one extra row to find out whether another page follows.
+        return self.set_page(list(queryset[:self.page_size + 1]))
+
+    def prepare_queryset(self, queryset, request, ordering=None):
+        """
+        Order and seek ``queryset`` for the requested cursor. The caller
+        fetches ``page_size + 1`` rows from it and hands them to set_page(),
+        which lets async views run the query with the async ORM.
+        """
+        if ordering:
+            self.ordering = ordering
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            self.reverse, self.current_position = False, None
+        else:
+            self.reverse, self.current_position = self.cursor.reverse, self.cursor.position
+
+        if self.reverse:
+            queryset = queryset.order_by(*(
+                field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering
+            ))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            value, pk = self._parse_position(self.current_position)
+            queryset = self.seek(queryset, value, pk, reverse=self.reverse, ordering=self.ordering)
+        return queryset
+
+    def set_page(self, results):
+        reverse, current_position = self.reverse, self.current_position
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(self.page[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.next_position
+        if self.page and self.cursor and self.cursor.reverse:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.previous_position
+        if self.page and not (self.cursor and self.cursor.reverse):
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        field = ordering[0].lstrip('-')
+        if isinstance(instance, dict):
+            value, pk = instance[field], instance['id']
+        else:
+            value, pk = getattr(instance, field), instance.pk
+        return f'{value.isoformat()}{self.position_separator}{pk}'
+
+    def _parse_position(self, position):
+        try:
+            value, pk = position.rsplit(self.position_separator, 1)
+            value = parse_datetime(value)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+
+class TodoSearchPagination(BasePagination):
+    """
+    Page-number pagination for ranked search results.
+
+    Rank isn't a column, so there is no key to seek on; search pages are
+    short and shallow, so OFFSET is acceptable here. Like the cursor
+    paginator it fetches one extra row instead of running COUNT(*), and
+    responds with the same ``next``/``previous``/``results`` shape.
+    """
+    page_size = TodoCursorPagination.page_size
+    page_size_query_param = 'page_size'
+    max_page_size = TodoCursorPagination.max_page_size
+    page_query_param = 'page'
+    invalid_page_message = 'Invalid page.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare_queryset(queryset, request)
+        return self.set_page(list(queryset))
+
+    def prepare_queryset(self, queryset, request):
+        """Slice ``queryset`` to the requested page plus one row; see set_page()."""
+        self.base_url = request.build_absolute_uri()
+        try:
+            self.page_size = min(
+                int(request.query_params.get(self.page_size_query_param, self.page_size)),
+                self.max_page_size,
+            )
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        if self.page_size < 1 or self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+        offset = (self.page_number - 1) * self.page_size
+        return queryset[offset:offset + self.page_size + 1]
+
+    def set_page(self, results):
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number == 1:
+            return None
+        if self.page_number == 2:
+            return remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(self.base_url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.utils import timezone
 from ..models import Todo
 
 class UserSerializer(serializers.ModelSerializer):
@@ -20,4 +21,43 @@ class TodoSerializer(serializers.ModelSerializer):
     class Meta:
         model = Todo
         fields = ('id', 'title', 'description', 'completed', 'created_at')
-        read_only_fields = ('created_at',) 
\ No newline at end of file
+        read_only_fields = ('created_at',)
+
+    def update(self, instance, validated_data):
+        """Write only the columns whose values changed, and nothing on a no-op."""
+        changed = instance.assign(validated_data)
+        if changed:
+            instance.save(update_fields=[*changed, 'updated_at'])
+        return instance
+
+    @classmethod
+    def values(cls, queryset):
+        """
+        Read-only fast path for lists: ``queryset.values()`` rows render to the
+        same JSON as ``TodoSerializer(todos, many=True).data`` without the
+        per-field to_representation calls. created_at stays a datetime; both
+        JSON renderers format it the way DateTimeField does.
+        """
+        return queryset.values(*cls.Meta.fields)
+
+    @staticmethod
+    def localize(rows):
+        """Shift created_at into the active timezone, as DateTimeField does."""
+        if timezone.get_current_timezone_name() != 'UTC':
+            for row in rows:
+                row['created_at'] = timezone.localtime(row['created_at'])
+        return rows
+
+class TodoBulkOperationSerializer(serializers.Serializer):
+    OPS = ('create', 'update', 'delete', 'toggle')
+
+    op = serializers.ChoiceField(choices=OPS)
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs['op'] == 'create':
+            attrs.pop('id', None)
+        elif 'id' not in attrs:
+            raise serializers.ValidationError({'id': f"This field is required for '{attrs['op']}'."})
+        return attrs
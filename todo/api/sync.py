@@ -0,0 +1,93 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from ..models import Todo, TodoVersion
+
+TOKEN_SALT = 'todo.sync'
+
+
+class InvalidSyncToken(Exception):
+    pass
+
+
+class ExpiredSyncToken(Exception):
+    pass
+
+
+def encode_token(sync_seq=0, pk=None):
+    """
+    A token for changes up to row ``pk`` of ``sync_seq``, or up to and
+    including all of ``sync_seq`` when ``pk`` is None.
+    """
+    # signing.dumps timestamps the token; decode_token checks its age.
+    payload = {'s': sync_seq} if pk is None else {'s': sync_seq, 'id': pk}
+    return signing.dumps(payload, salt=TOKEN_SALT, compress=True)
+
+
+def decode_token(token):
+    """Return the ``(sync_seq, id)`` high-water mark stored in a token."""
+    # Tombstones are compacted once they are older than the retention window,
+    # so a token issued before that may be missing deletes; the client has
+    # to resync from scratch.
+    max_age = timedelta(days=settings.TODO_SYNC_TOMBSTONE_RETENTION_DAYS)
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT, max_age=max_age)
+    except signing.SignatureExpired:
+        raise ExpiredSyncToken('Sync token expired')
+    except signing.BadSignature:
+        raise InvalidSyncToken('Invalid sync token')
+    if not isinstance(payload, dict):
+        raise InvalidSyncToken('Invalid sync token')
+    if 's' not in payload:
+        # Issued before the cursor moved to sync_seq (an updated_at mark).
+        raise ExpiredSyncToken('Sync token expired')
+    if not isinstance(payload['s'], int) or not isinstance(payload.get('id', 0), int):
+        raise InvalidSyncToken('Invalid sync token')
+    return payload['s'], payload.get('id')
+
+
+def current_token(user):
+    """Token for the newest change the user has, tombstones included."""
+    # Every write stamps its rows with the version it bumped to, under the
+    # version row lock, so every row up to the committed version is visible
+    # and any later write gets a higher number.
+    return encode_token(TodoVersion.current(user.pk))
+
+
+def changes_since(user, token, limit):
+    """
+    Return ``(changed, deleted_ids, next_token, has_more)`` for everything the
+    user changed after ``token``, oldest change first.
+    """
+    sync_seq, pk = decode_token(token)
+    queryset = Todo.all_objects.filter(user=user).defer('search_vector').order_by('sync_seq', 'id')
+    if pk is None:
+        queryset = queryset.filter(sync_seq__gt=sync_seq)
+    else:
+        queryset = queryset.filter(Q(sync_seq__gt=sync_seq) | Q(sync_seq=sync_seq, id__gt=pk))
+    rows = list(queryset[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changed = [todo for todo in rows if todo.deleted_at is None]
+    deleted_ids = [todo.id for todo in rows if todo.deleted_at is not None]
+    # Re-issued even when nothing changed, so a client that keeps syncing
+    # never holds an expired token.
+    next_token = encode_token(rows[-1].sync_seq, rows[-1].id) if rows else encode_token(sync_seq, pk)
+    return changed, deleted_ids, next_token, has_more
+
+
+def compact_tombstones(older_than=None):
+    """
+    Hard-delete tombstones past the retention window, or older than
+    ``older_than`` if that is earlier; returns the count.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.TODO_SYNC_TOMBSTONE_RETENTION_DAYS)
+    older_than = cutoff if older_than is None else min(older_than, cutoff)
+    # A raw DELETE: nothing references todos, and the post_delete receiver
+    # would bump each owner's version (invalidating their ETags and cached
+    # pages) for rows no client can see any more.
+    queryset = Todo.all_objects.tombstones().filter(deleted_at__lt=older_than)
+    return queryset._raw_delete(queryset.db)
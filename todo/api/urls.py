@@ -1,12 +1,24 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 from rest_framework_simplejwt.views import TokenRefreshView
 
+if settings.ASYNC_API:
+    # Served over ASGI: the hot todo endpoints use the async ORM.
+    from . import async_views as todo_views
+else:
+    todo_views = views
+
 urlpatterns = [
     path('register/', views.UserRegistrationView.as_view(), name='api-register'),
     path('login/', views.UserLoginView.as_view(), name='api-login'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
-    path('todos/', views.TodoListView.as_view(), name='api-todo-list'),
-    path('todos/<int:pk>/', views.TodoDetailView.as_view(), name='api-todo-detail'),
-    path('todos/<int:pk>/toggle/', views.TodoToggleView.as_view(), name='api-todo-toggle'),
-] 
\ No newline at end of file
+    path('todos/', todo_views.TodoListView.as_view(), name='api-todo-list'),
+    path('todos/bulk/', views.TodoBulkView.as_view(), name='api-todo-bulk'),
+    path('todos/import/', views.TodoImportView.as_view(), name='api-todo-import'),
+    path('todos/export/', views.TodoExportView.as_view(), name='api-todo-export'),
+    path('todos/sync/', todo_views.TodoSyncView.as_view(), name='api-todo-sync'),
+    path('todos/<int:pk>/', todo_views.TodoDetailView.as_view(), name='api-todo-detail'),
+    path('todos/<int:pk>/toggle/', todo_views.TodoToggleView.as_view(), name='api-todo-toggle'),
+    path('cache-stats/', views.CacheStatsView.as_view(), name='api-cache-stats'),
+]
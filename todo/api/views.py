@@ -1,11 +1,23 @@
-from rest_framework import generics, permissions, status
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from ..models import Todo
-from .serializers import UserSerializer, TodoSerializer
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
+from django.db.models import Case, Value, When
+from django.utils import timezone
+from ..models import Todo, TodoVersion
+from .. import cache as todo_cache, search, tasks, versioning
+from ..signals import todos_changed
+from .serializers import UserSerializer, TodoSerializer, TodoBulkOperationSerializer
+from .pagination import TodoCursorPagination, TodoSearchPagination
+from .renderers import ORJSONRenderer
+from . import export, filters, imports, sync
 import logging
+import os
 import time
 
 logger = logging.getLogger(__name__)
@@ -31,17 +43,111 @@ class UserLoginView(APIView):
             })
         return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
-class TodoListView(generics.ListCreateAPIView):
+class ConditionalGetMixin:
+    """
+    Answer GETs with an ETag built from the user's TodoVersion, and return 304
+    for a matching If-None-Match before the todo query runs.
+    """
+
+    def get(self, request, *args, **kwargs):
+        etag = versioning.request_etag(request)
+        not_modified = versioning.check_preconditions(request, etag)
+        if not_modified is not None:
+            return not_modified
+        return versioning.set_etag(super().get(request, *args, **kwargs), etag)
+
+
+class ConditionalWriteMixin:
+    """
+    Honor If-Match on writes so an edit based on stale data fails with 412
+    instead of silently overwriting a change made from another device.
+    """
+
+    def put(self, request, *args, **kwargs):
+        return self._conditional_write(super().put, request, *args, **kwargs)
+
+    def patch(self, request, *args, **kwargs):
+        return self._conditional_write(super().patch, request, *args, **kwargs)
+
+    def delete(self, request, *args, **kwargs):
+        return self._conditional_write(super().delete, request, *args, **kwargs)
+
+    def _conditional_write(self, handler, request, *args, **kwargs):
+        if 'HTTP_IF_MATCH' not in request.META and 'HTTP_IF_NONE_MATCH' not in request.META:
+            return handler(request, *args, **kwargs)
+        with transaction.atomic():
+            # Hold the version row so nobody else can write between the check and ours.
+            failed = versioning.check_preconditions(request, versioning.request_etag(request, lock=True))
+            if failed is not None:
+                return failed
+            response = handler(request, *args, **kwargs)
+            if status.is_success(response.status_code) and response.status_code != status.HTTP_204_NO_CONTENT:
+                versioning.set_etag(response, versioning.request_etag(request))
+        return response
+
+
+class TodoListView(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = TodoSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TodoCursorPagination
+
+    @property
+    def search_query(self):
+        return search.clean_query(self.request.query_params.get('q'))
+
+    @property
+    def paginator(self):
+        # Ranked search results can't be keyset-paginated on (created_at, id).
+        if not hasattr(self, '_paginator'):
+            self._paginator = TodoSearchPagination() if self.search_query else self.pagination_class()
+        return self._paginator
 
     def get_queryset(self):
-        return Todo.objects.filter(user=self.request.user)
+        queryset = Todo.objects.filter(user=self.request.user)
+        queryset, self.ordering = filters.filter_todos(
+            queryset, self.request.query_params, search=bool(self.search_query))
+        if self.search_query:
+            queryset = search.search(queryset, self.search_query)
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        # Only the default first page is cached; cursors and custom page
+        # sizes go straight to the database.
+        if request.query_params:
+            return super().get(request, *args, **kwargs)
+
+        # Writes only clear the cache entry in their own process (and a
+        # LocMem cache is per process), so an entry is trusted only while it
+        # matches the current version: one primary-key read.
+        version = TodoVersion.current(request.user.pk)
+        cached = todo_cache.get_first_page(request.user.pk)
+        if cached and cached[0] != version:
+            cached = None
+        etag = versioning.request_etag(request, version=version)
+        not_modified = versioning.check_preconditions(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        if cached:
+            response = Response(cached[1])
+        else:
+            response = self.list(request, *args, **kwargs)
+            todo_cache.set_first_page(request.user.pk, version, response.data)
+        return versioning.set_etag(response, etag)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        # Cursor positions are read off the page rows, so values() rows only
+        # work when they include the ordering column.
+        if self.ordering[0].lstrip('-') not in TodoSerializer.Meta.fields:
+            return super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(TodoSerializer.values(queryset))
+        return self.get_paginated_response(TodoSerializer.localize(page))
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class TodoDetailView(generics.RetrieveUpdateDestroyAPIView):
+class TodoDetailView(ConditionalGetMixin, ConditionalWriteMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TodoSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -52,22 +158,28 @@ class TodoDetailView(generics.RetrieveUpdateDestroyAPIView):
         try:
             logger.info(f"Update request received for todo {kwargs.get('pk')} by user {request.user.id}")
             logger.info(f"Request data: {request.data}")
-            instance = self.get_object()
-            logger.info(f"Found todo instance: {instance.id}")
-            
             # Create a copy of the request data
             data = request.data.copy()
             logger.info(f"Processing update with data: {data}")
             
-            # If only completed status is being updated
+            # If only completed status is being updated, write just that
+            # column, and only if it changes
             if len(data) == 1 and 'completed' in data:
                 logger.info(f"Updating only completed status to {data['completed']}")
-                instance.completed = data['completed']
-                instance.save()
+                try:
+                    completed = serializers.BooleanField().to_internal_value(data['completed'])
+                except serializers.ValidationError as e:
+                    return Response({'completed': e.detail}, status=status.HTTP_400_BAD_REQUEST)
+                instance, changed = Todo.set_completed(request.user.pk, kwargs['pk'], completed)
+                if instance is None:
+                    return Response({'error': 'Todo not found'}, status=status.HTTP_404_NOT_FOUND)
                 serializer = self.get_serializer(instance)
-                logger.info(f"Todo {instance.id} completed status updated successfully")
+                logger.info(f"Todo {instance.id} completed status {'updated' if changed else 'unchanged'}")
                 return Response(serializer.data)
             
+            instance = self.get_object()
+            logger.info(f"Found todo instance: {instance.id}")
+            
             # For other updates, use the serializer
             logger.info("Using serializer for full update")
             serializer = self.get_serializer(instance, data=data, partial=True)
@@ -91,7 +203,7 @@ class TodoDetailView(generics.RetrieveUpdateDestroyAPIView):
             # Log the todo details before deletion
             logger.info(f"Todo to be deleted - ID: {instance.id}, Title: {instance.title}, User: {instance.user.id}")
             
-            self.perform_destroy(instance)
+            instance.soft_delete()
             logger.info(f"Todo {instance.id} deleted successfully")
             return Response(status=status.HTTP_204_NO_CONTENT)
         except Todo.DoesNotExist:
@@ -110,39 +222,281 @@ class TodoDetailView(generics.RetrieveUpdateDestroyAPIView):
 class TodoToggleView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
-        return Todo.objects.filter(user=self.request.user)
-
-    def get_object(self, pk):
-        try:
-            return self.get_queryset().get(pk=pk)
-        except Todo.DoesNotExist:
-            return None
-
     def post(self, request, pk):
         logger.info(f"POST request received for todo {pk}")
         return self._toggle_todo(pk)
 
     def _toggle_todo(self, pk):
-        todo = self.get_object(pk)
-        if not todo:
+        try:
+            todo = Todo.toggle(self.request.user.pk, pk)
+        except Exception as e:
+            logger.error(f"Error toggling todo: {str(e)}")
+            return Response(
+                {'error': 'Failed to toggle todo. Please try again.'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        if todo is None:
             logger.warning(f"Todo {pk} not found")
             return Response(
                 {'error': 'Todo not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
-        
+        logger.info(f"Todo {todo.id} toggled to completed={todo.completed}")
+        return Response(TodoSerializer(todo).data)
+
+class TodoSyncView(APIView):
+    """
+    Delta sync for mobile clients.
+
+    Without ``since`` this only returns a token for the user's latest change,
+    which clients should take before loading the list. With ``since`` it
+    returns what changed after that token, so the cost follows the number of
+    changes rather than the size of the list.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    limit = 500
+
+    def get(self, request):
+        since = request.query_params.get('since')
+        if not since:
+            return Response({
+                'changes': [],
+                'deleted': [],
+                'token': sync.current_token(request.user),
+                'has_more': False,
+            })
+
         try:
-            logger.info(f"Current completed status: {todo.completed}")
-            todo.completed = not todo.completed
-            todo.save()
-            logger.info(f"New completed status: {todo.completed}")
-            serializer = TodoSerializer(todo)
-            logger.info(f"Todo {todo.id} toggled successfully")
-            return Response(serializer.data)
-        except Exception as e:
-            logger.error(f"Error toggling todo: {str(e)}")
+            changed, deleted_ids, token, has_more = sync.changes_since(request.user, since, self.limit)
+        except sync.InvalidSyncToken as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except sync.ExpiredSyncToken as e:
+            return Response({'error': str(e)}, status=status.HTTP_410_GONE)
+
+        return Response({
+            'changes': TodoSerializer(changed, many=True).data,
+            'deleted': deleted_ids,
+            'token': token,
+            'has_more': has_more,
+        })
+
+
+class CacheStatsView(APIView):
+    """Hit/miss counters of the todo list cache for this worker process."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({'pid': os.getpid(), 'stats': todo_cache.snapshot()})
+
+class TodoBulkView(APIView):
+    """
+    Apply a batch of create/update/delete/toggle operations in one request.
+
+    The whole batch is validated first; if any item is invalid nothing is
+    written and the per-item errors are returned with a 400. Otherwise the
+    batch runs in a single transaction with one statement per operation type.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_operations = 500
+
+    def post(self, request):
+        operations = request.data.get('operations') if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
             return Response(
-                {'error': 'Failed to toggle todo. Please try again.'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            ) 
\ No newline at end of file
+                {'error': "'operations' must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(operations) > self.max_operations:
+            return Response(
+                {'error': f'A batch may contain at most {self.max_operations} operations'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            # Bulk statements bypass Todo.save(), so take the batch's sequence
+            # number here, before the rows are locked (the order save() uses).
+            sync_seq = todos_changed(request.user.pk)
+            results, plan = self._validate(request.user, operations)
+            if plan is None:
+                transaction.set_rollback(True)
+                return Response({'results': results}, status=status.HTTP_400_BAD_REQUEST)
+            self._apply(request.user, plan, results, sync_seq)
+
+        return Response({'results': results})
+
+    def _validate(self, user, operations):
+        results = [None] * len(operations)
+        parsed = []
+        failed = False
+        for index, operation in enumerate(operations):
+            op_serializer = TodoBulkOperationSerializer(data=operation)
+            if not op_serializer.is_valid():
+                results[index] = {'status': status.HTTP_400_BAD_REQUEST, 'errors': op_serializer.errors}
+                failed = True
+                continue
+            parsed.append((index, op_serializer.validated_data))
+
+        ids = [op['id'] for _, op in parsed if 'id' in op]
+        # Rows are locked so toggles flip the state they were read with.
+        todos = Todo.objects.select_for_update().filter(user=user, pk__in=ids).in_bulk()
+        seen = set()
+        plan = []
+        for index, op in parsed:
+            pk = op.get('id')
+            if pk is not None:
+                if pk in seen:
+                    results[index] = {'id': pk, 'status': status.HTTP_400_BAD_REQUEST,
+                                      'errors': {'id': ['A todo may only appear once per batch.']}}
+                    failed = True
+                    continue
+                seen.add(pk)
+                if pk not in todos:
+                    results[index] = {'id': pk, 'status': status.HTTP_404_NOT_FOUND,
+                                      'errors': {'id': ['Todo not found.']}}
+                    failed = True
+                    continue
+
+            serializer = None
+            if op['op'] == 'create':
+                serializer = TodoSerializer(data=op['data'])
+            elif op['op'] == 'update':
+                serializer = TodoSerializer(todos[pk], data=op['data'], partial=True)
+            if serializer is not None and not serializer.is_valid():
+                results[index] = {'id': pk, 'status': status.HTTP_400_BAD_REQUEST, 'errors': serializer.errors}
+                failed = True
+                continue
+
+            plan.append((index, op['op'], todos.get(pk), serializer))
+
+        if failed:
+            # Valid items are not applied either; say so explicitly.
+            for index, _, todo, _ in plan:
+                results[index] = {'id': todo.pk if todo else None, 'status': status.HTTP_424_FAILED_DEPENDENCY}
+            return results, None
+        return results, plan
+
+    def _apply(self, user, plan, results, sync_seq):
+        now = timezone.now()
+        creates, updates, update_fields, toggles, deletes = [], [], {'updated_at', 'sync_seq'}, [], []
+        for index, op, todo, serializer in plan:
+            if op == 'create':
+                creates.append((index, Todo(user=user, sync_seq=sync_seq, **serializer.validated_data)))
+            elif op == 'update':
+                for attr, value in serializer.validated_data.items():
+                    setattr(todo, attr, value)
+                    update_fields.add(attr)
+                todo.updated_at = now
+                todo.sync_seq = sync_seq
+                updates.append((index, todo))
+            elif op == 'toggle':
+                todo.completed = not todo.completed
+                todo.updated_at = now
+                todo.sync_seq = sync_seq
+                toggles.append((index, todo))
+            else:
+                deletes.append((index, todo))
+
+        if creates:
+            Todo.objects.bulk_create([todo for _, todo in creates])
+        if updates:
+            Todo.objects.bulk_update([todo for _, todo in updates], sorted(update_fields))
+        if toggles:
+            Todo.objects.filter(pk__in=[todo.pk for _, todo in toggles]).update(
+                completed=Case(When(completed=True, then=Value(False)), default=Value(True)),
+                updated_at=now,
+                sync_seq=sync_seq,
+            )
+        if deletes:
+            Todo.objects.filter(pk__in=[todo.pk for _, todo in deletes]).update(
+                deleted_at=now,
+                updated_at=now,
+                sync_seq=sync_seq,
+            )
+
+        for group, code in ((creates, status.HTTP_201_CREATED), (updates, status.HTTP_200_OK),
+                            (toggles, status.HTTP_200_OK)):
+            for index, todo in group:
+                results[index] = {'id': todo.pk, 'status': code, 'data': TodoSerializer(todo).data}
+        for index, todo in deletes:
+            results[index] = {'id': todo.pk, 'status': status.HTTP_204_NO_CONTENT}
+
+
+class FileFormatMixin:
+    """
+    ``?format=`` names a file format (ndjson, csv) on these views, not a DRF
+    renderer, so skip renderer negotiation: every DRF response is JSON.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        renderer = ORJSONRenderer()
+        return renderer, renderer.media_type
+
+
+@method_decorator(gzip_page, name='dispatch')
+class TodoExportView(FileFormatMixin, APIView):
+    """
+    Stream every todo the user has as NDJSON (default) or CSV, gzipped on the
+    fly for clients that accept it. Meant for backups and data portability
+    jobs that would otherwise page through the list endpoint. POST queues the
+    same export to be emailed to the user instead.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def export_format(self, request):
+        format = request.query_params.get('format', 'ndjson')
+        if format not in export.FORMATS:
+            return None, Response(
+                {'format': [f"Must be one of: {', '.join(export.FORMATS)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return format, None
+
+    def get(self, request):
+        format, error = self.export_format(request)
+        if error:
+            return error
+        response = StreamingHttpResponse(export.stream(request.user, format), content_type=export.FORMATS[format])
+        response['Content-Disposition'] = f'attachment; filename="todos.{format}"'
+        return response
+
+    def post(self, request):
+        format, error = self.export_format(request)
+        if error:
+            return error
+        if not request.user.email:
+            return Response({'error': 'Your account has no email address'}, status=status.HTTP_400_BAD_REQUEST)
+        tasks.email_export.enqueue(user_id=request.user.pk, format=format)
+        return Response({'detail': f'The export will be emailed to {request.user.email}.'},
+                        status=status.HTTP_202_ACCEPTED)
+
+
+class TodoImportView(FileFormatMixin, APIView):
+    """
+    Import todos from an NDJSON or CSV upload, sent either as the raw request
+    body or as a multipart ``file`` field. The body is read incrementally and
+    the response reports how many rows were created and which lines failed.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        if request.content_type.startswith('multipart/form-data'):
+            # Django spools large uploads to a temporary file, not memory.
+            stream = request.FILES.get('file')
+            is_csv = stream is not None and (
+                stream.name.lower().endswith('.csv') or stream.content_type.startswith('text/csv'))
+        else:
+            stream = request.stream
+            is_csv = request.content_type.startswith('text/csv')
+
+        format = request.query_params.get('format', 'csv' if is_csv else 'ndjson')
+        if format not in imports.FORMATS:
+            return Response(
+                {'format': [f"Must be one of: {', '.join(imports.FORMATS)}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if stream is None:
+            return Response({'detail': 'No file uploaded.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = imports.import_todos(request.user, stream, format)
+        logger.info(f"Imported {report.created} todos for user {request.user.id} ({report.failed} failed)")
+        return Response(report.as_dict(), status=status.HTTP_201_CREATED if report.created else status.HTTP_200_OK)
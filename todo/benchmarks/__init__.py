@@ -0,0 +1,84 @@
+"""
+Benchmark helpers shared by the ``benchmark`` management command: latency
+summaries, JSON result files and run-to-run comparison.
+"""
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime, timezone
+import django
+from django.conf import settings
+from django.db import connection
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples, wall_time, errors=0, queries=None):
+    """Summarize per-request latencies (seconds) into the result format."""
+    ordered = sorted(samples)
+    ms = lambda value: round(value * 1000, 3) if value is not None else None  # noqa: E731
+    summary = {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput_rps': round(len(ordered) / wall_time, 2) if wall_time else None,
+        'mean_ms': ms(sum(ordered) / len(ordered)) if ordered else None,
+        'p50_ms': ms(percentile(ordered, 50)),
+        'p95_ms': ms(percentile(ordered, 95)),
+        'p99_ms': ms(percentile(ordered, 99)),
+    }
+    if queries is not None:
+        summary['queries_per_request'] = round(queries, 2)
+    return summary
+
+
+def run_metadata(**extra):
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        **extra,
+    }
+
+
+def write_results(path, results):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, metrics=('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')):
+    """
+    Yield ``(suite, scenario, metric, before, after, change_pct)`` for every
+    metric present in both runs.
+    """
+    for suite, scenarios in current.get('results', {}).items():
+        for name, after in scenarios.items():
+            before = baseline.get('results', {}).get(suite, {}).get(name)
+            if not before:
+                continue
+            for metric in metrics:
+                old, new = before.get(metric), after.get(metric)
+                if old is None or new is None:
+                    continue
+                change = round((new - old) / old * 100, 1) if old else None
+                yield suite, name, metric, old, new, change
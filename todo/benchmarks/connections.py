@@ -0,0 +1,62 @@
+"""
+Connection reuse benchmark: one scenario driven through the test client with
+the request_started/request_finished connection housekeeping a real server
+does (the test client skips it), under each connection policy. Shows how much
+of a request's latency is opening the database connection.
+"""
+import time
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from . import summarize
+from .scenarios import QueryCounter
+
+POLICIES = {
+    # CONN_MAX_AGE=0: connect on every request.
+    'per-request': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': False},
+    # Health checks ping a reused connection once per request before use.
+    'persistent+health': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True},
+    # Whatever DATABASES says (DB_CONN_MAX_AGE, DB_CONN_HEALTH_CHECKS).
+    'configured': {},
+}
+
+
+def run(policy, scenario, ctx, requests):
+    """Summary for ``scenario`` under ``policy``, with connects per request."""
+    saved = {key: connection.settings_dict.get(key) for key in POLICIES[policy]}
+    connection.settings_dict.update(POLICIES[policy])
+    connection.close()
+    connects = []
+    on_connect = lambda sender, connection, **kwargs: connects.append(connection)  # noqa: E731
+    connection_created.connect(on_connect)
+    client = Client()
+    samples, errors = [], 0
+    counter = QueryCounter()
+    try:
+        with connection.execute_wrapper(counter):
+            wall_start = time.perf_counter()
+            for i in range(requests):
+                path, body, headers, session = scenario.build(ctx, i)
+                extra = {f'HTTP_{k.upper().replace("-", "_")}': v
+                         for k, v in headers.items() if k != 'Content-Type'}
+                start = time.perf_counter()
+                # What WSGIHandler does around each request; both signals run
+                # close_old_connections.
+                request_started.send(sender=None)
+                response = client.generic(
+                    scenario.method, path, body or '', content_type=headers.get('Content-Type', ''),
+                    secure=True, **extra,
+                )
+                request_finished.send(sender=None)
+                samples.append(time.perf_counter() - start)
+                errors += response.status_code >= 400
+            wall_time = time.perf_counter() - wall_start
+    finally:
+        connection_created.disconnect(on_connect)
+        connection.close()
+        connection.settings_dict.update(saved)
+    result = summarize(samples, wall_time, errors, queries=counter.count / requests)
+    result['connects_per_request'] = round(len(connects) / requests, 2)
+    return result
@@ -0,0 +1,51 @@
+"""
+Memory of a process tree, read from /proc (Linux only).
+
+RSS counts pages shared copy-on-write with the gunicorn master once per
+worker; PSS divides each shared page among the processes mapping it, so
+the PSS total is what the tree really costs.
+"""
+import os
+
+
+def children(pid):
+    pids = []
+    try:
+        for tid in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{tid}/children') as f:
+                pids.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return pids
+
+
+def tree(pid):
+    pids = [pid]
+    for child in children(pid):
+        pids.extend(tree(child))
+    return pids
+
+
+def memory(pid):
+    """``{'rss': kB, 'pss': kB}`` for one process, or None if it's gone."""
+    result = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss'):
+                    result[key.lower()] = int(value.split()[0])
+    except OSError:
+        return None
+    return result
+
+
+def tree_memory(pid):
+    """Worker count and total RSS/PSS in MB for ``pid`` and its descendants."""
+    pids = tree(pid)
+    samples = [sample for sample in map(memory, pids) if sample]
+    return {
+        'processes': len(pids),
+        'rss_mb': round(sum(sample.get('rss', 0) for sample in samples) / 1024, 1),
+        'pss_mb': round(sum(sample.get('pss', 0) for sample in samples) / 1024, 1),
+    }
@@ -0,0 +1,272 @@
+"""
+Request scenarios covering every route in todo/urls.py and todo/api/urls.py,
+plus runners that drive them through the Django test client or over HTTP
+against a real gunicorn process.
+"""
+import http.client
+import itertools
+import json
+import re
+import string
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from urllib.parse import urlencode, urlsplit
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.db import connection
+from django.test import Client
+from django.utils.crypto import get_random_string
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..api import sync
+from ..models import Todo
+from ..signals import todos_changed
+from . import summarize
+from .seed import PASSWORD, USERNAME_PREFIX
+
+
+class Scenario:
+    """
+    One request shape. ``path`` and ``data`` may be callables taking
+    ``(ctx, i)`` so each iteration can address a different todo.
+    """
+
+    def __init__(self, name, method, path, auth=None, data=None, content='json', route=None,
+                 headers=None, setup=None, session=None):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.auth = auth
+        self.data = data
+        self.content = content
+        self.route = route or name
+        self.headers = headers or {}
+        self.setup = setup
+        self.session = session
+
+    def build(self, ctx, i):
+        path = self.path(ctx, i) if callable(self.path) else self.path
+        data = self.data(ctx, i) if callable(self.data) else self.data
+        headers = dict(self.headers)
+        if self.auth == 'jwt':
+            headers['Authorization'] = f'Bearer {ctx.access}'
+        session = None
+        if self.auth == 'session':
+            session = self.session(ctx, i) if self.session else ctx.session
+        body = None
+        if data is not None:
+            if self.content == 'json':
+                body, headers['Content-Type'] = json.dumps(data), 'application/json'
+            else:
+                body, headers['Content-Type'] = urlencode(data), 'application/x-www-form-urlencoded'
+        return path, body, headers, session
+
+
+class Context:
+    """Users, tokens, sessions and todo ids the scenarios run against."""
+
+    def __init__(self, user, requests):
+        self.user = user
+        self.requests = requests
+        # The cache-stats endpoint is staff-only.
+        if not user.is_staff:
+            user.is_staff = True
+            user.save(update_fields=['is_staff'])
+        refresh = RefreshToken.for_user(user)
+        self.refresh, self.access = str(refresh), str(refresh.access_token)
+        self.session = self.make_session()
+        self.csrf = get_random_string(32, string.ascii_letters + string.digits)
+        self.todo_ids = list(Todo.objects.filter(user=user).values_list('id', flat=True)[:1000])
+        self.page2 = self.second_page_path()
+        self.sync_token = sync.current_token(user)
+        self.spares = []
+
+    def make_session(self):
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        store[SESSION_KEY] = str(self.user.pk)
+        store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        store[HASH_SESSION_KEY] = self.user.get_session_auth_hash()
+        store.save()
+        return store.session_key
+
+    def second_page_path(self):
+        client = Client()
+        response = client.get('/api/todos/', HTTP_AUTHORIZATION=f'Bearer {self.access}', secure=True)
+        next_url = response.json().get('next') if response.status_code == 200 else None
+        if not next_url:
+            return '/api/todos/'
+        parts = urlsplit(next_url)
+        return f'{parts.path}?{parts.query}'
+
+    def todo(self, i):
+        return self.todo_ids[i % len(self.todo_ids)]
+
+    def make_spares(self, n):
+        """Throwaway todos for scenarios that delete one per iteration."""
+        spares = Todo.objects.bulk_create(
+            [Todo(user=self.user, title=f'Spare {i}') for i in range(n)]
+        )
+        todos_changed(self.user.pk)
+        self.spares = [todo.pk for todo in spares]
+
+    def make_spare_sessions(self, n):
+        self.spare_sessions = [self.make_session() for _ in range(n)]
+
+
+def unique_username(ctx, i):
+    return f'{USERNAME_PREFIX}reg_{uuid.uuid4().hex[:12]}'
+
+
+SCENARIOS = [
+    # API
+    Scenario('api-register', 'POST', '/api/register/',
+             data=lambda ctx, i: {'username': unique_username(ctx, i), 'password': PASSWORD}),
+    Scenario('api-login', 'POST', '/api/login/',
+             data=lambda ctx, i: {'username': ctx.user.username, 'password': PASSWORD}),
+    Scenario('token-refresh', 'POST', '/api/token/refresh/', data=lambda ctx, i: {'refresh': ctx.refresh}),
+    Scenario('api-todo-list', 'GET', '/api/todos/', auth='jwt'),
+    Scenario('api-todo-list-page-2', 'GET', lambda ctx, i: ctx.page2, auth='jwt', route='api-todo-list'),
+    Scenario('api-todo-search', 'GET', '/api/todos/?q=benchmark+todo+42', auth='jwt', route='api-todo-list'),
+    Scenario('api-todo-create', 'POST', '/api/todos/', auth='jwt', route='api-todo-list',
+             data=lambda ctx, i: {'title': f'Created {i}', 'description': 'benchmark'}),
+    Scenario('api-todo-detail', 'GET', lambda ctx, i: f'/api/todos/{ctx.todo(i)}/', auth='jwt'),
+    Scenario('api-todo-detail-patch', 'PATCH', lambda ctx, i: f'/api/todos/{ctx.todo(i)}/', auth='jwt',
+             route='api-todo-detail', data=lambda ctx, i: {'title': f'Edited {i}'}),
+    Scenario('api-todo-toggle', 'POST', lambda ctx, i: f'/api/todos/{ctx.todo(i)}/toggle/', auth='jwt'),
+    Scenario('api-todo-delete', 'DELETE', lambda ctx, i: f'/api/todos/{ctx.spares[i]}/', auth='jwt',
+             route='api-todo-detail', setup=lambda ctx: ctx.make_spares(ctx.requests)),
+    Scenario('api-todo-bulk', 'POST', '/api/todos/bulk/', auth='jwt',
+             data=lambda ctx, i: {'operations': [{'op': 'toggle', 'id': ctx.todo(i * 20 + n)} for n in range(20)]}),
+    Scenario('api-todo-export', 'GET', '/api/todos/export/', auth='jwt', headers={'Accept-Encoding': 'gzip'}),
+    Scenario('api-todo-sync', 'GET', lambda ctx, i: f'/api/todos/sync/?since={ctx.sync_token}', auth='jwt'),
+    Scenario('api-cache-stats', 'GET', '/api/cache-stats/', auth='jwt'),
+    # HTML
+    Scenario('todo_list', 'GET', '/', auth='session'),
+    Scenario('todo_list-search', 'GET', '/?q=benchmark+todo+42', auth='session', route='todo_list'),
+    Scenario('signup', 'GET', '/signup/'),
+    Scenario('login', 'GET', '/login/'),
+    Scenario('todo_create', 'GET', '/todo/create/', auth='session'),
+    Scenario('todo_create-post', 'POST', '/todo/create/', auth='session', content='form', route='todo_create',
+             data=lambda ctx, i: {'title': f'Created {i}', 'description': 'benchmark'}),
+    Scenario('todo_update', 'GET', lambda ctx, i: f'/todo/{ctx.todo(i)}/update/', auth='session'),
+    Scenario('todo_update-post', 'POST', lambda ctx, i: f'/todo/{ctx.todo(i)}/update/', auth='session',
+             content='form', route='todo_update', data=lambda ctx, i: {'title': f'Edited {i}'}),
+    Scenario('todo_toggle_complete', 'POST', lambda ctx, i: f'/todo/{ctx.todo(i)}/toggle/', auth='session',
+             headers={'X-Requested-With': 'XMLHttpRequest'}),
+    Scenario('todo_delete', 'GET', lambda ctx, i: f'/todo/{ctx.todo(i)}/delete/', auth='session'),
+    Scenario('todo_delete-post', 'POST', lambda ctx, i: f'/todo/{ctx.spares[i]}/delete/', auth='session',
+             content='form', route='todo_delete', data={}, setup=lambda ctx: ctx.make_spares(ctx.requests)),
+    Scenario('password_reset', 'GET', '/password-reset/'),
+    Scenario('password_reset_done', 'GET', '/password-reset/done/'),
+    Scenario('password_reset_confirm', 'GET', '/password-reset-confirm/MQ/invalid-token/'),
+    Scenario('password_reset_complete', 'GET', '/password-reset-complete/'),
+    Scenario('logout', 'POST', '/logout/', auth='session', content='form', data={},
+             session=lambda ctx, i: ctx.spare_sessions[i],
+             setup=lambda ctx: ctx.make_spare_sessions(ctx.requests)),
+    Scenario('metrics', 'GET', '/metrics'),
+]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def run_client(scenario, ctx, requests):
+    """Drive ``scenario`` in-process through the Django test client."""
+    client = Client()
+    samples, errors = [], 0
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        wall_start = time.perf_counter()
+        for i in range(requests):
+            path, body, headers, session = scenario.build(ctx, i)
+            if session:
+                client.cookies[settings.SESSION_COOKIE_NAME] = session
+            extra = {f'HTTP_{k.upper().replace("-", "_")}': v for k, v in headers.items() if k != 'Content-Type'}
+            start = time.perf_counter()
+            response = client.generic(
+                scenario.method, path, body or '', content_type=headers.get('Content-Type', ''),
+                secure=True, **extra,
+            )
+            samples.append(time.perf_counter() - start)
+            errors += response.status_code >= 400
+        wall_time = time.perf_counter() - wall_start
+    return summarize(samples, wall_time, errors, queries=counter.count / requests)
+
+
+class HTTPTarget:
+    """A running server on localhost, reached with plain http.client."""
+
+    def __init__(self, port, metrics_token=''):
+        self.port = port
+        self.metrics_token = metrics_token
+
+    def request(self, method, path, body=None, headers=None, session=None, csrf=None):
+        headers = dict(headers or {})
+        # Pretend to come through the TLS proxy so SECURE_SSL_REDIRECT
+        # doesn't bounce every request.
+        headers['X-Forwarded-Proto'] = 'https'
+        headers['Host'] = f'127.0.0.1:{self.port}'
+        cookies = []
+        if session:
+            cookies.append(f'{settings.SESSION_COOKIE_NAME}={session}')
+        if csrf and method not in ('GET', 'HEAD'):
+            cookies.append(f'{settings.CSRF_COOKIE_NAME}={csrf}')
+            headers['X-CSRFToken'] = csrf
+            headers['Origin'] = f'https://127.0.0.1:{self.port}'
+        if cookies:
+            headers['Cookie'] = '; '.join(cookies)
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            content = response.read()
+            return response.status, content
+        finally:
+            conn.close()
+
+    def query_totals(self):
+        """``{route: (query_sum, request_count)}`` scraped from /metrics."""
+        headers = {'Authorization': f'Bearer {self.metrics_token}'} if self.metrics_token else {}
+        status, content = self.request('GET', '/metrics', headers=headers)
+        totals = {}
+        if status != 200:
+            return totals
+        pattern = re.compile(r'^todo_db_queries_per_request_(sum|count)\{route="([^"]+)"\} (\S+)$', re.M)
+        for kind, route, value in pattern.findall(content.decode()):
+            query_sum, count = totals.get(route, (0.0, 0.0))
+            totals[route] = (float(value), count) if kind == 'sum' else (query_sum, float(value))
+        return totals
+
+
+def run_http(scenario, ctx, requests, target, concurrency):
+    """Drive ``scenario`` over HTTP with ``concurrency`` parallel clients."""
+    before = target.query_totals()
+    counter = itertools.count()
+
+    def one(_):
+        i = next(counter)
+        path, body, headers, session = scenario.build(ctx, i)
+        start = time.perf_counter()
+        status, _ = target.request(scenario.method, path, body, headers, session=session, csrf=ctx.csrf)
+        return time.perf_counter() - start, status
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, range(requests)))
+    wall_time = time.perf_counter() - wall_start
+
+    after = target.query_totals()
+    queries = None
+    if scenario.route in after:
+        query_sum = after[scenario.route][0] - before.get(scenario.route, (0, 0))[0]
+        count = after[scenario.route][1] - before.get(scenario.route, (0, 0))[1]
+        queries = query_sum / count if count else None
+    errors = sum(status >= 400 for _, status in outcomes)
+    return summarize([latency for latency, _ in outcomes], wall_time, errors, queries=queries)
@@ -0,0 +1,50 @@
+import random
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from ..models import Todo
+from ..signals import todos_changed
+
+USERNAME_PREFIX = 'bench_user_'
+PASSWORD = 'bench-password-123'
+
+
+def seed(users, todos_per_user, seed=0, batch_size=5000):
+    """
+    Create ``users`` benchmark users with ``todos_per_user`` todos each,
+    reusing whatever an earlier run left behind. Returns the users.
+    """
+    rng = random.Random(seed)
+    names = [f'{USERNAME_PREFIX}{i}' for i in range(users)]
+    existing = set(User.objects.filter(username__in=names).values_list('username', flat=True))
+    # One hash shared by every synthetic user; hashing per user would
+    # dominate the seeding time.
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        [User(username=name, email=f'{name}@example.com', password=password)
+         for name in names if name not in existing],
+        batch_size=batch_size,
+    )
+    seeded = list(User.objects.filter(username__in=names).order_by('id'))
+
+    with transaction.atomic():
+        for user in seeded:
+            missing = todos_per_user - Todo.objects.filter(user=user).count()
+            if missing <= 0:
+                continue
+            Todo.objects.bulk_create(
+                [Todo(
+                    user=user,
+                    title=f'Benchmark todo {n}',
+                    description='x' * rng.randint(0, 200),
+                    completed=rng.random() < 0.4,
+                ) for n in range(missing)],
+                batch_size=batch_size,
+            )
+            todos_changed(user.pk)
+    return seeded
+
+
+def cleanup():
+    """Delete every benchmark user (their todos cascade)."""
+    return User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
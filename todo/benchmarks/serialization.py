@@ -0,0 +1,69 @@
+"""
+Microbenchmark for the list response body: TodoSerializer + DRF's JSONRenderer
+against values() rows + ORJSONRenderer, on in-memory data so only
+serialization and rendering are timed.
+"""
+import statistics
+import time
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from ..api.renderers import ORJSONRenderer
+from ..api.serializers import TodoSerializer
+from ..models import Todo
+
+NEXT = 'https://example.com/api/todos/?cursor=cD0yMDI2LTEwLTE4VDE5JTNBMjYlM0ExNC4xMjM0NTYlMkIwMCUzQTAwJTdDNDI%3D'
+
+
+def make_todos(n):
+    now = timezone.now()
+    return [
+        Todo(
+            id=i + 1,
+            title=f'Buy groceries for the trip #{i} — café',
+            description='Remember to bring the receipts.\nCheck the confirmation email first.' if i % 2 else '',
+            completed=i % 3 == 0,
+            created_at=now - timedelta(seconds=i, microseconds=i * 7 % 1000000),
+        )
+        for i in range(n)
+    ]
+
+
+def as_values(todos):
+    """The rows TodoSerializer.values() would fetch for ``todos``."""
+    return [{field: getattr(todo, field) for field in TodoSerializer.Meta.fields} for todo in todos]
+
+
+def drf_body(todos):
+    data = {'next': NEXT, 'previous': None, 'results': TodoSerializer(todos, many=True).data}
+    return JSONRenderer().render(data)
+
+
+def fast_body(rows):
+    data = {'next': NEXT, 'previous': None, 'results': TodoSerializer.localize(rows)}
+    return ORJSONRenderer().render(data)
+
+
+def timed(func, arg, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run(size, repeat):
+    """Median milliseconds per response body for both paths at ``size`` items."""
+    todos = make_todos(size)
+    rows = as_values(todos)
+    if drf_body(todos) != fast_body([dict(row) for row in rows]):
+        raise AssertionError('fast path output differs from TodoSerializer + JSONRenderer')
+    drf = timed(drf_body, todos, repeat)
+    fast = timed(fast_body, rows, repeat)
+    return {
+        'items': size,
+        'drf_ms': round(drf * 1000, 3),
+        'fast_ms': round(fast * 1000, 3),
+        'speedup': round(drf / fast, 1),
+    }
@@ -0,0 +1,35 @@
+"""
+Session backend comparison: the session-authenticated HTML scenarios run
+through the test client once per ``SESSION_MODE``, so the only difference
+between runs is where the session lives.
+"""
+from django.conf import settings
+from django.test.utils import override_settings
+from ..models import Todo
+from ..signals import todos_changed
+from . import scenarios
+
+MODES = tuple(settings.SESSION_ENGINES)
+HTML_SCENARIOS = ('todo_list', 'todo_create', 'todo_update', 'todo_update-post', 'todo_toggle_complete')
+FIXTURE_FIELDS = ('title', 'description', 'completed')
+
+
+def run(mode, user, requests, names=HTML_SCENARIOS):
+    """``{scenario: summary}`` for ``names`` with ``mode``'s session engine."""
+    selected = [scenario for scenario in scenarios.SCENARIOS if scenario.name in names]
+    with override_settings(SESSION_ENGINE=settings.SESSION_ENGINES[mode]):
+        # The context's session is created with the engine under test.
+        ctx = scenarios.Context(user, requests)
+        fixture = list(Todo.objects.filter(pk__in=ctx.todo_ids).only('pk', *FIXTURE_FIELDS))
+        results = {}
+        try:
+            for scenario in selected:
+                if scenario.setup:
+                    scenario.setup(ctx)
+                results[scenario.name] = scenarios.run_client(scenario, ctx, requests)
+        finally:
+            # Put the edited and toggled todos back, so the next mode does
+            # the same writes rather than re-posting titles it already has.
+            Todo.objects.bulk_update(fixture, FIXTURE_FIELDS)
+            todos_changed(user.pk)
+    return results
@@ -0,0 +1,88 @@
+"""
+Worker boot profiling. Each measurement runs in a fresh interpreter, since
+everything measured here happens only once per process.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from django.conf import settings
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+# Mirrors django.setup() step by step, then the app's URL and warm-up work.
+PHASES_SCRIPT = '''
+import json, time
+timings = []
+start = last = time.perf_counter()
+def phase(name):
+    global last
+    now = time.perf_counter()
+    timings.append((name, now - last))
+    last = now
+import django
+phase('import django')
+from django.conf import settings
+settings.INSTALLED_APPS
+phase('settings (pydantic Settings + settings.py)')
+from django.utils.log import configure_logging
+configure_logging(settings.LOGGING_CONFIG, settings.LOGGING)
+phase('logging')
+from django.apps import apps
+apps.populate(settings.INSTALLED_APPS)
+phase('apps.populate (app configs, models, ready())')
+from todoproject import wsgi
+phase('WSGI handler and middleware')
+from todoproject import warmup
+warmup.warm_urls()
+phase('URLconf and views')
+warmup.warm_api()
+warmup.warm_models()
+phase('DRF settings, serializers, model metadata')
+if not settings.API_ONLY:
+    warmup.warm_templates()
+    phase('templates')
+timings.append(('total', time.perf_counter() - start))
+print(json.dumps(timings))
+'''
+
+
+def child_env(api_only=None):
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'todoproject.settings')}
+    if api_only is not None:
+        env['API_ONLY'] = str(api_only)
+    return env
+
+
+def importtime(env):
+    """``[(module, self_us, cumulative_us, depth)]`` for ``django.setup()``."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import django; django.setup()'],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return modules
+
+
+def top_level_packages(modules):
+    """Cumulative import time per top-level package, largest first."""
+    totals = {}
+    for module, self_us, _, _ in modules:
+        package = module.split('.')[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def phases(env):
+    """``[(phase, seconds)]`` for one boot, ending with the total."""
+    result = subprocess.run(
+        [sys.executable, '-c', PHASES_SCRIPT],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
@@ -0,0 +1,43 @@
+"""
+Fast multi-row writes for seeding and imports.
+
+On PostgreSQL rows are streamed with ``COPY ... FROM STDIN`` through psycopg 3's
+``cursor.copy()``. Other databases get batched ``executemany`` INSERTs. Rows
+go in exactly as given: no model ``save()``, no signals and no
+``auto_now``/``auto_now_add``, so callers set every timestamp themselves and
+call ``todos_changed()`` for the users they touched.
+"""
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def copy_rows(connection, table, columns, rows):
+    quoted = ', '.join(connection.ops.quote_name(column) for column in columns)
+    with connection.cursor() as cursor:
+        with cursor.copy(f'COPY {connection.ops.quote_name(table)} ({quoted}) FROM STDIN') as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def insert_rows(connection, table, columns, rows, batch_size=500):
+    adapt = connection.ops.adapt_datetimefield_value
+    quoted = ', '.join(connection.ops.quote_name(column) for column in columns)
+    placeholders = ', '.join(['%s'] * len(columns))
+    sql = f'INSERT INTO {connection.ops.quote_name(table)} ({quoted}) VALUES ({placeholders})'
+    with connection.cursor() as cursor:
+        batch = []
+        for row in rows:
+            batch.append(tuple(adapt(value) if hasattr(value, 'tzinfo') else value for value in row))
+            if len(batch) >= batch_size:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+
+
+def write_rows(table, columns, rows, using=DEFAULT_DB_ALIAS, use_copy=True):
+    """Write an iterable of row tuples, with COPY where the database has it."""
+    connection = connections[using]
+    if use_copy and connection.vendor == 'postgresql':
+        copy_rows(connection, table, columns, rows)
+    else:
+        insert_rows(connection, table, columns, rows)
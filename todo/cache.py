@@ -0,0 +1,59 @@
+"""
+Read-through cache for each user's todo list.
+
+Entries are dropped whenever the user's todos change (see ``todo.signals``),
+but only in the cache the writing process sees; with a per-process LocMem
+cache other workers keep theirs. So each entry stores the TodoVersion it was
+built at, and readers use it only while that is still the current version.
+Hit/miss counters are per process.
+"""
+from collections import Counter
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+FIRST_PAGE_KEY = 'todo:first-page:{user_id}'
+HTML_LIST_KEY = 'todo:html-list:{user_id}'
+
+stats = Counter()
+
+
+def get_cache():
+    return caches[settings.TODO_LIST_CACHE_ALIAS]
+
+
+def _get(kind, key):
+    value = get_cache().get(key)
+    stats[f'{kind}_hits' if value is not None else f'{kind}_misses'] += 1
+    return value
+
+
+def get_first_page(user_id):
+    """Return ``(version, data)`` for the API's first page, or None."""
+    return _get('first_page', FIRST_PAGE_KEY.format(user_id=user_id))
+
+
+def set_first_page(user_id, version, data):
+    get_cache().set(FIRST_PAGE_KEY.format(user_id=user_id), (version, data), settings.TODO_LIST_CACHE_TIMEOUT)
+
+
+def get_html_list(user_id):
+    """Return ``(version, todos)`` for the HTML list's first page, or None."""
+    return _get('html_list', HTML_LIST_KEY.format(user_id=user_id))
+
+
+def set_html_list(user_id, version, todos):
+    get_cache().set(HTML_LIST_KEY.format(user_id=user_id), (version, todos), settings.TODO_LIST_CACHE_TIMEOUT)
+
+
+def invalidate(user_id):
+    keys = [FIRST_PAGE_KEY.format(user_id=user_id), HTML_LIST_KEY.format(user_id=user_id)]
+    get_cache().delete_many(keys)
+    # A read running alongside the write may have re-filled the entry with
+    # pre-commit data, so drop it again once the write is visible.
+    transaction.on_commit(lambda: get_cache().delete_many(keys))
+    stats['invalidations'] += 1
+
+
+def snapshot():
+    return dict(stats)
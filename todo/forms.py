@@ -1,6 +1,8 @@
 from django import forms
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
+from django.contrib.sites.shortcuts import get_current_site
 from .models import Todo
+from .tasks import send_password_reset
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -29,6 +31,30 @@ class CustomUserCreationForm(UserCreationForm):
         model = User
         fields = ('username', 'email', 'password1', 'password2')
 
+class QueuedPasswordResetForm(PasswordResetForm):
+    """
+    Queues a reset email for each matching user instead of sending it. The
+    worker makes the token and renders the email, so no usable reset link is
+    ever stored in the task table.
+    """
+
+    def save(self, domain_override=None, subject_template_name='registration/password_reset_subject.txt',
+             email_template_name='registration/password_reset_email.html', use_https=False,
+             token_generator=None, from_email=None, request=None, html_email_template_name=None,
+             extra_email_context=None):
+        if domain_override:
+            site_name = domain = domain_override
+        else:
+            current_site = get_current_site(request)
+            site_name, domain = current_site.name, current_site.domain
+        for user in self.get_users(self.cleaned_data['email']):
+            send_password_reset.enqueue(
+                user_id=user.pk, domain=domain, site_name=site_name, use_https=use_https,
+                subject_template_name=subject_template_name, email_template_name=email_template_name,
+                html_email_template_name=html_email_template_name, from_email=from_email,
+                extra_email_context=extra_email_context,
+            )
+
 class TodoForm(forms.ModelForm):
     title = forms.CharField(
         max_length=200,
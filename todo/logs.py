@@ -0,0 +1,96 @@
+"""
+Logging helpers: a JSON formatter for the request log and a LOGGING_CONFIG
+hook that moves every configured handler behind a QueueHandler, so file and
+console writes happen on a listener thread instead of the request thread.
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+
+QUEUE_SIZE = 10000
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``record.payload`` supplies the fields."""
+
+    def format(self, record):
+        line = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+        }
+        payload = getattr(record, 'payload', None)
+        if payload is not None:
+            line.update(payload)
+        else:
+            line['message'] = record.getMessage()
+        if record.exc_info:
+            line['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(line, default=str, separators=(',', ':'))
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of erroring when the queue is full."""
+    dropped = 0
+
+    def prepare(self, record):
+        # The queue never leaves the process, so skip the stock pre-formatting
+        # and let the listener thread do all of the string work.
+        return copy.copy(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+_listeners = []
+
+
+def configure(config):
+    """
+    ``LOGGING_CONFIG`` callable: apply ``config`` with dictConfig, then swap
+    each configured logger's handlers for a queue drained by a background
+    QueueListener owning the original handlers.
+    """
+    logging.config.dictConfig(config)
+
+    queued = {}
+    names = list(config.get('loggers', {}))
+    for name in names:
+        logger = logging.getLogger(name)
+        if not logger.handlers:
+            continue
+        targets = tuple(logger.handlers)
+        if targets not in queued:
+            handler = DroppingQueueHandler(queue.Queue(QUEUE_SIZE))
+            listener = logging.handlers.QueueListener(handler.queue, *targets, respect_handler_level=True)
+            listener.start()
+            _listeners.append((handler, listener))
+            queued[targets] = handler
+        logger.handlers = [queued[targets]]
+
+
+def _stop_listeners():
+    for _, listener in _listeners:
+        if listener._thread is not None:
+            listener.stop()
+
+
+def _restart_listeners_in_child():
+    # Threads don't survive fork (gunicorn preload_app), and the queue lock
+    # may have been held mid-put, so each worker gets a fresh queue and thread.
+    for handler, listener in _listeners:
+        handler.queue = listener.queue = queue.Queue(QUEUE_SIZE)
+        listener._thread = None
+        listener.start()
+
+
+atexit.register(_stop_listeners)
+os.register_at_fork(after_in_child=_restart_listeners_in_child)
@@ -0,0 +1,154 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from todo import benchmarks
+from todo.benchmarks import scenarios, seed
+
+
+class Command(BaseCommand):
+    """Django command to benchmark every endpoint against a seeded dataset"""
+
+    help = (
+        "Seed N users x M todos, drive every HTML and API endpoint through the "
+        "test client and/or a local gunicorn process, and report throughput, "
+        "p50/p95/p99 latency and queries per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10, help='Benchmark users to seed')
+        parser.add_argument('--todos', type=int, default=1000, help='Todos per benchmark user')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+        parser.add_argument('--mode', choices=('client', 'gunicorn', 'both'), default='client')
+        parser.add_argument('--concurrency', type=int, default=8, help='Parallel clients in gunicorn mode')
+        parser.add_argument('--workers', type=int, default=4, help='gunicorn workers in gunicorn mode')
+        parser.add_argument('--port', type=int, default=0, help='Port for gunicorn (default: a free one)')
+        parser.add_argument('--only', nargs='*', help='Run only these scenarios')
+        parser.add_argument('--output', help='Write JSON results to this file')
+        parser.add_argument('--compare', help='Print the change against an earlier JSON result file')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for the dataset')
+        parser.add_argument('--cleanup', action='store_true', help='Delete the benchmark users afterwards')
+
+    def handle(self, *args, **options):
+        selected = [s for s in scenarios.SCENARIOS if not options['only'] or s.name in options['only']]
+        if not selected:
+            raise CommandError('No scenarios match --only.')
+
+        self.stdout.write(f"Seeding {options['users']} users x {options['todos']} todos...")
+        users = seed.seed(options['users'], options['todos'], seed=options['seed'])
+
+        results = {
+            'meta': benchmarks.run_metadata(
+                users=options['users'], todos_per_user=options['todos'], requests=options['requests'],
+                concurrency=options['concurrency'], workers=options['workers'],
+            ),
+            'results': {},
+        }
+        # Scenarios may delete or log out; they run against the first user.
+        with override_settings(ALLOWED_HOSTS=settings.ALLOWED_HOSTS + ['testserver', '127.0.0.1']):
+            if options['mode'] in ('client', 'both'):
+                results['results']['client'] = self.run_suite(
+                    selected, users[0], options,
+                    lambda scenario, ctx: scenarios.run_client(scenario, ctx, options['requests']),
+                )
+            if options['mode'] in ('gunicorn', 'both'):
+                with self.gunicorn(options) as target:
+                    results['results']['gunicorn'] = self.run_suite(
+                        selected, users[0], options,
+                        lambda scenario, ctx: scenarios.run_http(
+                            scenario, ctx, options['requests'], target, options['concurrency']),
+                    )
+
+        if options['output']:
+            benchmarks.write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        if options['compare']:
+            self.print_comparison(benchmarks.load_results(options['compare']), results)
+        if options['cleanup']:
+            seed.cleanup()
+
+    def run_suite(self, selected, user, options, run):
+        ctx = scenarios.Context(user, options['requests'])
+        suite = {}
+        self.stdout.write(
+            f"\n{'scenario':<28} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>8} {'errors':>7}"
+        )
+        for scenario in selected:
+            if scenario.setup:
+                scenario.setup(ctx)
+            result = suite[scenario.name] = run(scenario, ctx)
+            queries = result.get('queries_per_request')
+            self.stdout.write(
+                f"{scenario.name:<28} {result['throughput_rps']:>9} {result['p50_ms']:>9} "
+                f"{result['p95_ms']:>9} {result['p99_ms']:>9} "
+                f"{queries if queries is not None else '-':>8} {result['errors']:>7}"
+            )
+        return suite
+
+    def gunicorn(self, options):
+        return GunicornProcess(options['port'] or free_port(), options['workers'], self.stdout)
+
+    def print_comparison(self, baseline, current):
+        self.stdout.write(f"\nChange vs {baseline.get('meta', {}).get('commit') or 'baseline'}:")
+        for suite, name, metric, old, new, change in benchmarks.compare(baseline, current):
+            change = f'{change:+.1f}%' if change is not None else 'n/a'
+            self.stdout.write(f'{suite:<9} {name:<28} {metric:<20} {old:>10} -> {new:<10} {change}')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class GunicornProcess:
+    """Run gunicorn.conf.py on localhost for the duration of a with-block."""
+
+    def __init__(self, port, workers, stdout, env=None):
+        self.port = port
+        # None leaves the count to gunicorn.conf.py's sizing.
+        self.workers = workers
+        self.stdout = stdout
+        self.env = env or {}
+
+    def __enter__(self):
+        env = {
+            **os.environ,
+            'ALLOWED_HOSTS': ','.join(settings.ALLOWED_HOSTS + ['127.0.0.1']),
+            'PROMETHEUS_MULTIPROC_DIR': os.path.join(
+                os.environ.get('TMPDIR', '/tmp'), f'todoproject-bench-metrics-{self.port}'),
+            **self.env,
+        }
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                   '--bind', f'127.0.0.1:{self.port}', '--access-logfile', '/dev/null']
+        if self.workers:
+            command += ['--workers', str(self.workers)]
+        self.stdout.write(
+            f"\nStarting gunicorn on 127.0.0.1:{self.port} with {self.workers or 'auto-sized'} workers...")
+        self.process = subprocess.Popen(
+            command, cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise CommandError('gunicorn exited during startup; run it by hand to see why.')
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.2)
+        else:
+            self.process.terminate()
+            raise CommandError('gunicorn did not start listening within 60 seconds.')
+        return scenarios.HTTPTarget(self.port, settings.METRICS_TOKEN)
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from todo.benchmarks import connections, scenarios, seed
+
+
+class Command(BaseCommand):
+    """Django command to measure connection setup in request latency"""
+
+    help = (
+        "Drive one scenario with per-request connections, persistent "
+        "connections (with and without health checks) and the configured "
+        "DATABASES settings, and report latency and connects per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', default='api-todo-detail', help='Scenario name from the benchmark command')
+        parser.add_argument('--policies', nargs='+', choices=list(connections.POLICIES),
+                            default=list(connections.POLICIES))
+        parser.add_argument('--requests', type=int, default=500, help='Requests per policy')
+        parser.add_argument('--todos', type=int, default=100, help='Todos for the benchmark user')
+
+    def handle(self, *args, **options):
+        try:
+            scenario = next(s for s in scenarios.SCENARIOS if s.name == options['scenario'])
+        except StopIteration:
+            raise CommandError(f"Unknown scenario {options['scenario']!r}.")
+        if scenario.setup:
+            raise CommandError('Pick a scenario that can repeat without per-request setup.')
+
+        user = seed.seed(1, options['todos'])[0]
+        self.stdout.write(f"{scenario.name} on {connection.vendor}, {options['requests']} requests per policy\n")
+        self.stdout.write(f"{'policy':<20} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'connects':>9} {'queries':>8}")
+        with override_settings(ALLOWED_HOSTS=settings.ALLOWED_HOSTS + ['testserver']):
+            ctx = scenarios.Context(user, options['requests'])
+            for policy in options['policies']:
+                result = connections.run(policy, scenario, ctx, options['requests'])
+                self.stdout.write(
+                    f"{policy:<20} {result['throughput_rps']:>9} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+                    f"{result['connects_per_request']:>9} {result['queries_per_request']:>8}"
+                )
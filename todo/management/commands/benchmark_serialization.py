@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from todo.benchmarks import serialization
+
+
+class Command(BaseCommand):
+    """Django command to compare the list serialization paths"""
+
+    help = (
+        "Time TodoSerializer + JSONRenderer against the values() + orjson fast "
+        "path used by the list endpoint, after checking both produce identical bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='Items per response')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement (median is reported)')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'items':>8} {'drf ms':>10} {'fast ms':>10} {'speedup':>8}")
+        for size in options['sizes']:
+            result = serialization.run(size, options['repeat'])
+            self.stdout.write(
+                f"{result['items']:>8} {result['drf_ms']:>10} {result['fast_ms']:>10} {result['speedup']:>7}x"
+            )
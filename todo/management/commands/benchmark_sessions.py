@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from todo.benchmarks import scenarios, seed, sessions
+
+
+class Command(BaseCommand):
+    """Django command to compare the session backends on the HTML views"""
+
+    help = (
+        "Run the session-authenticated HTML scenarios through the test client "
+        "with each SESSION_MODE and report throughput, p50 latency and queries "
+        "per request side by side."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', nargs='+', choices=sessions.MODES, default=list(sessions.MODES))
+        parser.add_argument('--only', nargs='+', default=list(sessions.HTML_SCENARIOS),
+                            help='Scenarios to run (names from the benchmark command)')
+        parser.add_argument('--todos', type=int, default=1000, help='Todos for the benchmark user')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per scenario and mode')
+
+    def handle(self, *args, **options):
+        names = [s.name for s in scenarios.SCENARIOS if s.name in options['only']]
+        if not names:
+            raise CommandError('No scenarios match --only.')
+        user = seed.seed(1, options['todos'])[0]
+        with override_settings(ALLOWED_HOSTS=settings.ALLOWED_HOSTS + ['testserver']):
+            results = {mode: sessions.run(mode, user, options['requests'], names) for mode in options['modes']}
+
+        self.stdout.write(f"{'scenario':<24} {'mode':<16} {'rps':>9} {'p50 ms':>9} {'queries':>8} {'errors':>7}")
+        for name in names:
+            for mode in options['modes']:
+                result = results[mode][name]
+                self.stdout.write(
+                    f"{name:<24} {mode:<16} {result['throughput_rps']:>9} {result['p50_ms']:>9} "
+                    f"{result['queries_per_request']:>8} {result['errors']:>7}"
+                )
@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from todo.benchmarks import processes, scenarios, seed
+from .benchmark import GunicornProcess, free_port
+
+MODELS = ('sync', 'gthread', 'asgi')
+
+
+class Command(BaseCommand):
+    """Django command to compare gunicorn worker models"""
+
+    help = (
+        "Start gunicorn.conf.py once per GUNICORN_WORKER_MODEL, drive the same "
+        "scenarios over HTTP, and report throughput, p95 latency and the "
+        "process tree's RSS and PSS after the run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--models', nargs='+', choices=MODELS, default=list(MODELS))
+        parser.add_argument('--workers', type=int, help='Workers per model (default: gunicorn.conf.py sizing)')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per gthread worker')
+        parser.add_argument('--only', nargs='+', default=['api-todo-list', 'api-todo-detail', 'todo_list'],
+                            help='Scenarios to run (names from the benchmark command)')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=16, help='Parallel clients')
+        parser.add_argument('--todos', type=int, default=1000, help='Todos for the benchmark user')
+
+    def handle(self, *args, **options):
+        selected = [s for s in scenarios.SCENARIOS if s.name in options['only']]
+        if not selected:
+            raise CommandError('No scenarios match --only.')
+        if any(s.setup for s in selected):
+            raise CommandError('Pick scenarios that can repeat without per-request setup.')
+
+        user = seed.seed(1, options['todos'])[0]
+        rows = []
+        with override_settings(ALLOWED_HOSTS=settings.ALLOWED_HOSTS + ['testserver', '127.0.0.1']):
+            ctx = scenarios.Context(user, options['requests'])
+            for model in options['models']:
+                env = {'GUNICORN_WORKER_MODEL': model, 'GUNICORN_THREADS': str(options['threads'])}
+                server = GunicornProcess(free_port(), options['workers'], self.stdout, env=env)
+                with server as target:
+                    # One pass to warm every worker, then the measured pass.
+                    for scenario in selected:
+                        scenarios.run_http(scenario, ctx, options['concurrency'] * 4, target, options['concurrency'])
+                    results = {
+                        scenario.name: scenarios.run_http(
+                            scenario, ctx, options['requests'], target, options['concurrency'])
+                        for scenario in selected
+                    }
+                    memory = processes.tree_memory(server.process.pid)
+                rows.append((model, results, memory))
+
+        self.stdout.write(
+            f"\n{'model':<9} {'scenario':<20} {'rps':>9} {'p95 ms':>9} {'errors':>7}"
+            f" {'procs':>6} {'RSS MB':>8} {'PSS MB':>8}"
+        )
+        for model, results, memory in rows:
+            for name, result in results.items():
+                self.stdout.write(
+                    f"{model:<9} {name:<20} {result['throughput_rps']:>9} {result['p95_ms']:>9} "
+                    f"{result['errors']:>7} {memory['processes']:>6} {memory['rss_mb']:>8} {memory['pss_mb']:>8}"
+                )
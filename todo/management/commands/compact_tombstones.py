@@ -0,0 +1,27 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from todo.api.sync import compact_tombstones
+
+
+class Command(BaseCommand):
+    """Django command to purge soft-deleted todos past the sync retention window"""
+
+    help = "Hard-delete todo tombstones older than TODO_SYNC_TOMBSTONE_RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.TODO_SYNC_TOMBSTONE_RETENTION_DAYS,
+            help='Only purge tombstones older than this many days (at least the retention setting)',
+        )
+
+    def handle(self, *args, **options):
+        retention = settings.TODO_SYNC_TOMBSTONE_RETENTION_DAYS
+        if options['days'] < retention:
+            # Unexpired sync tokens still need these tombstones to learn
+            # about the deletes.
+            raise CommandError(f'--days must be at least TODO_SYNC_TOMBSTONE_RETENTION_DAYS ({retention}).')
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        count = compact_tombstones(older_than=cutoff)
+        self.stdout.write(self.style.SUCCESS(f'Compacted {count} tombstone(s).'))
@@ -0,0 +1,64 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from todo import search
+from todo.api.pagination import TodoCursorPagination
+from todo.models import Todo
+
+
+class Command(BaseCommand):
+    """Django command to print the query plan of every todo view's queryset"""
+
+    help = "Run EXPLAIN on the querysets used by the HTML and API todo views."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--search', default='groceries', help='Search string for the ?q= plans')
+        parser.add_argument('--user', help='Username or id to scope the queries to (default: user with most todos)')
+        parser.add_argument('--analyze', action='store_true', help='Execute the queries (EXPLAIN ANALYZE)')
+
+    def get_user(self, value):
+        if value is None:
+            user = (
+                User.objects.annotate(todo_count=Count('todo'))
+                .order_by('-todo_count')
+                .first()
+            )
+        elif value.isdigit():
+            user = User.objects.filter(pk=int(value)).first()
+        else:
+            user = User.objects.filter(username=value).first()
+        if user is None:
+            raise CommandError('No matching user found; seed some data first.')
+        return user
+
+    def get_querysets(self, user, q):
+        todos = Todo.objects.filter(user=user)
+        page_size = TodoCursorPagination.page_size
+        first_page = todos.order_by(*TodoCursorPagination.ordering)
+        anchor = first_page.values_list('created_at', 'id')[page_size - 1:page_size].first()
+        pk = todos.values_list('id', flat=True).first() or 0
+
+        querysets = [
+            ('todo_list', todos),
+            ('api-todo-list (first page)', first_page[:page_size + 1]),
+            ('api-todo-detail / todo_update / todo_delete', todos.filter(pk=pk)),
+            ('api-todo-toggle / todo_toggle_complete', todos.filter(pk=pk)),
+            ('incomplete todos', todos.filter(completed=False)),
+            ('api-todo-list (?completed=true)', todos.filter(completed=True).order_by(*TodoCursorPagination.ordering)[:page_size + 1]),
+            ('api-todo-list (?ordering=-updated_at)', todos.order_by('-updated_at', '-id')[:page_size + 1]),
+            (f'api-todo-list / todo_list (?q={q})', search.search(todos, q)[:page_size + 1]),
+        ]
+        if anchor is not None:
+            next_page = TodoCursorPagination.seek(first_page, *anchor)
+            querysets.insert(2, ('api-todo-list (next page)', next_page[:page_size + 1]))
+        return querysets
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['user'])
+        self.stdout.write(f'Query plans for user {user.username} (id={user.pk}) on {connection.vendor}')
+        explain_options = {'analyze': True} if options['analyze'] else {}
+        for name, queryset in self.get_querysets(user, options['search']):
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name}'))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
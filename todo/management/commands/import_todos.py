@@ -0,0 +1,41 @@
+import json
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from todo.api import imports
+
+
+class Command(BaseCommand):
+    """Django command to import todos for a user from an NDJSON or CSV file"""
+
+    help = (
+        "Stream an NDJSON or CSV file (as written by /api/todos/export/) into a "
+        "user's todos, validating each row and reporting the lines that fail."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--user', required=True, help='Username or id that will own the todos')
+        parser.add_argument('--format', choices=imports.FORMATS,
+                            help='File format (default: from the extension, else ndjson)')
+        parser.add_argument('--batch-size', type=int, default=imports.BATCH_SIZE, help='Rows per transaction')
+
+    def handle(self, *args, **options):
+        value = options['user']
+        user = User.objects.filter(**{'pk': int(value)} if value.isdigit() else {'username': value}).first()
+        if user is None:
+            raise CommandError(f'No user matches {value!r}.')
+        format = options['format'] or ('csv' if options['path'].lower().endswith('.csv') else 'ndjson')
+
+        try:
+            with open(options['path'], 'rb') as f:
+                report = imports.import_todos(user, f, format, batch_size=options['batch_size'])
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f'... and {report.failed - len(report.errors)} more failed lines')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {report.created} todos for {user.username}; {report.failed} lines failed.'
+        ))
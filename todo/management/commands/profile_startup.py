@@ -0,0 +1,45 @@
+import subprocess
+from django.core.management.base import BaseCommand, CommandError
+from todo.benchmarks import startup
+
+
+class Command(BaseCommand):
+    """Django command to profile worker boot"""
+
+    help = (
+        "Boot the app in fresh interpreters and report the time spent in each "
+        "django.setup() phase plus URL and warm-up work, and the slowest "
+        "imports from -X importtime."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15, help='Packages and modules to list')
+        parser.add_argument('--runs', type=int, default=3, help='Boots to average the phases over')
+        parser.add_argument('--compare-api-only', action='store_true',
+                            help='Also boot with API_ONLY=True and show both')
+
+    def handle(self, *args, **options):
+        modes = [('configured', None)]
+        if options['compare_api_only']:
+            modes = [('full', False), ('api-only', True)]
+        try:
+            for label, api_only in modes:
+                self.report(label, startup.child_env(api_only), options)
+        except subprocess.CalledProcessError as e:
+            raise CommandError(f'Boot failed:\n{e.stderr}')
+
+    def report(self, label, env, options):
+        runs = [startup.phases(env) for _ in range(options['runs'])]
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label}: boot phases (mean of {len(runs)} runs)'))
+        for index, (name, _) in enumerate(runs[0]):
+            mean = sum(run[index][1] for run in runs) / len(runs)
+            self.stdout.write(f'  {name:<48} {mean * 1000:>8.1f} ms')
+
+        modules = startup.importtime(env)
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label}: import time by top-level package'))
+        for package, self_us in startup.top_level_packages(modules)[:options['top']]:
+            self.stdout.write(f'  {package:<48} {self_us / 1000:>8.1f} ms')
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label}: slowest single modules (self time)'))
+        for module, self_us, _, _ in sorted(modules, key=lambda m: m[1], reverse=True)[:options['top']]:
+            self.stdout.write(f'  {module:<48} {self_us / 1000:>8.1f} ms')
+        self.stdout.write(f"  {len(modules)} modules, {sum(m[1] for m in modules) / 1000:.1f} ms total")
@@ -0,0 +1,31 @@
+import signal
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from todo import tasks
+
+
+class Command(BaseCommand):
+    """Django command to run queued background tasks"""
+
+    help = (
+        "Claim due tasks with SELECT ... FOR UPDATE SKIP LOCKED and run them on a "
+        "thread pool, retrying failures with exponential backoff. Run as many "
+        "workers as needed; SIGTERM or SIGINT stops claiming and lets running "
+        "tasks finish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=settings.TASK_WORKER_THREADS,
+                            help='Tasks to run at once')
+        parser.add_argument('--poll-interval', type=float, default=settings.TASK_POLL_INTERVAL,
+                            help='Seconds between polls when the queue is empty')
+        parser.add_argument('--burst', action='store_true', help='Exit once no task is due')
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *args: stop.set())
+        self.stdout.write(f"Running tasks on {options['threads']} thread(s)...")
+        succeeded, failed = tasks.work(options['threads'], options['poll_interval'], stop, burst=options['burst'])
+        self.stdout.write(self.style.SUCCESS(f'Stopped: {succeeded} task(s) succeeded, {failed} failed.'))
@@ -0,0 +1,126 @@
+import math
+import random
+import time
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from todo.bulkload import write_rows
+from todo.models import Todo
+
+VERBS = [
+    'Buy', 'Call', 'Email', 'Fix', 'Review', 'Plan', 'Book', 'Pay', 'Clean', 'Write',
+    'Schedule', 'Renew', 'Order', 'Return', 'Prepare', 'Update', 'Cancel', 'Pick up', 'Finish', 'Read',
+]
+OBJECTS = [
+    'groceries', 'the dentist', 'rent', 'the car', 'quarterly report', 'flight tickets', 'the garage',
+    'passport', 'birthday gift', 'insurance', 'team meeting notes', 'the kitchen sink', 'library books',
+    'electricity bill', 'blog post', 'gym membership', 'slides for Monday', 'mom', 'the landlord', 'tax forms',
+]
+CONTEXTS = ['', '', '', ' before Friday', ' this weekend', ' for the trip', ' at work', ' tomorrow', ' ASAP']
+SENTENCES = [
+    'Remember to bring the receipts.',
+    'Check the confirmation email first.',
+    'Ask about the discount they mentioned last time.',
+    'Needs to be done before the end of the month.',
+    'Coordinate with the rest of the team.',
+    'Low priority, but keeps slipping.',
+    'Compare prices online before going.',
+    'The phone number is in the shared contacts.',
+]
+
+USER_COLUMNS = (
+    'password', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+    'is_staff', 'is_active', 'date_joined',
+)
+TODO_COLUMNS = ('title', 'description', 'completed', 'created_at', 'updated_at', 'user_id')
+
+# Synthetic users can't log in; a fixed unusable hash skips password hashing
+# entirely (see django.contrib.auth.hashers.UNUSABLE_PASSWORD_PREFIX).
+UNUSABLE_PASSWORD = '!seeded'
+
+
+class Command(BaseCommand):
+    """Django command to generate large synthetic user and todo datasets"""
+
+    help = (
+        "Generate users and todos with realistic title, description and completion "
+        "distributions. Streams rows with COPY on PostgreSQL and falls back to "
+        "chunked multi-row inserts elsewhere; memory stays bounded by --chunk-size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Users to create')
+        parser.add_argument('--todos-per-user', type=float, default=100,
+                            help='Mean todos per user (log-normally distributed)')
+        parser.add_argument('--max-todos-per-user', type=int, default=100000)
+        parser.add_argument('--days', type=int, default=365, help='Spread created_at over this many days')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Users per transaction')
+        parser.add_argument('--prefix', default='seed_user_', help='Username prefix')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed')
+        parser.add_argument('--no-copy', action='store_true', help='Use inserts even on PostgreSQL')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.options = options
+        use_copy = connection.vendor == 'postgresql' and not options['no_copy']
+
+        start_index = User.objects.filter(username__startswith=options['prefix']).count()
+        total_users = total_todos = 0
+        started = time.monotonic()
+        for chunk_start in range(0, options['users'], options['chunk_size']):
+            count = min(options['chunk_size'], options['users'] - chunk_start)
+            names = [f"{options['prefix']}{start_index + chunk_start + n}" for n in range(count)]
+            with transaction.atomic():
+                write_rows(User._meta.db_table, USER_COLUMNS, self.user_rows(names), use_copy=use_copy)
+                # Read the ids before COPY starts: psycopg holds the connection
+                # lock for the whole copy() block, so a query from inside the
+                # row generator would deadlock.
+                user_ids = list(User.objects.filter(username__in=names).values_list('id', flat=True))
+                todo_counter = [0]
+                write_rows(Todo._meta.db_table, TODO_COLUMNS, self.todo_rows(user_ids, todo_counter),
+                           use_copy=use_copy)
+            total_users += count
+            total_todos += todo_counter[0]
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'{total_users} users, {total_todos} todos '
+                f'({total_todos / elapsed:,.0f} todos/s)'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {total_users} users and {total_todos} todos in {time.monotonic() - started:.1f}s "
+            f"using {'COPY' if use_copy else 'INSERT'}."
+        ))
+
+    def user_rows(self, names):
+        for name in names:
+            joined = self.now - timedelta(days=self.rng.uniform(0, self.options['days']))
+            yield (UNUSABLE_PASSWORD, False, name, '', '', f'{name}@example.com', False, True, joined)
+
+    def todo_rows(self, user_ids, counter):
+        # Log-normal counts: most users have a handful of todos, a few have
+        # thousands, with the requested mean.
+        sigma = 1.0
+        mu = math.log(max(self.options['todos_per_user'], 1)) - sigma ** 2 / 2
+        span = self.options['days'] * 86400
+        for user_id in user_ids:
+            n = min(int(self.rng.lognormvariate(mu, sigma)), self.options['max_todos_per_user'])
+            offsets = sorted(self.rng.uniform(0, span) for _ in range(n))
+            for offset in offsets:
+                created_at = self.now - timedelta(seconds=span - offset)
+                age = 1 - offset / span
+                # Older todos are more likely to be done.
+                completed = self.rng.random() < 0.15 + 0.7 * age
+                updated_at = created_at + timedelta(seconds=self.rng.uniform(0, (span - offset) * 0.2))
+                counter[0] += 1
+                yield (self.title(), self.description(), completed, created_at, updated_at, user_id)
+
+    def title(self):
+        return f'{self.rng.choice(VERBS)} {self.rng.choice(OBJECTS)}{self.rng.choice(CONTEXTS)}'
+
+    def description(self):
+        if self.rng.random() < 0.55:
+            return ''
+        return ' '.join(self.rng.choice(SENTENCES) for _ in range(self.rng.randint(1, 3)))
@@ -0,0 +1,81 @@
+"""
+Per-route request metrics exported in Prometheus text format at /metrics.
+
+Under gunicorn every worker writes its samples to PROMETHEUS_MULTIPROC_DIR
+(set in gunicorn.conf.py) and the endpoint merges them, so a scrape sees
+the whole server no matter which worker answers it.
+"""
+import os
+import time
+from contextvars import ContextVar
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'todo_http_request_duration_seconds', 'Request latency by route.', ['route', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSES = Counter('todo_http_responses_total', 'Responses by route and status.', ['route', 'method', 'status'])
+DB_QUERIES = Histogram(
+    'todo_db_queries_per_request', 'SQL queries issued per request.', ['route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+DB_TIME = Counter('todo_db_query_seconds_total', 'Time spent in SQL by route.', ['route'])
+
+# Stats for the request being handled. A ContextVar rather than a
+# per-request execute_wrapper so queries the async views run through
+# sync_to_async are counted too.
+current_request = ContextVar('todo_metrics_request', default=None)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+def count_queries(execute, sql, params, many, context):
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.monotonic()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.monotonic() - start
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def observe(request, response, duration, stats):
+    match = getattr(request, 'resolver_match', None)
+    route = match.url_name or match.view_name if match else 'unmatched'
+    REQUEST_LATENCY.labels(route, request.method).observe(duration)
+    RESPONSES.labels(route, request.method, str(response.status_code)).inc()
+    DB_QUERIES.labels(route).observe(stats.queries)
+    if stats.db_time:
+        DB_TIME.labels(route).inc(stats.db_time)
+
+
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden()
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
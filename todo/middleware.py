@@ -1,34 +1,203 @@
+import json
 import logging
+import random
 import time
-from django.http import HttpResponseServerError
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import QueryDict
+from django.utils.functional import SimpleLazyObject, empty
+from . import metrics, routers
 
 logger = logging.getLogger(__name__)
+request_logger = logging.getLogger('todo.requests')
+
+REDACTED = '[REDACTED]'
+SENSITIVE_KEYS = {
+    'password', 'password1', 'password2', 'new_password1', 'new_password2', 'old_password',
+    'token', 'access', 'refresh', 'secret', 'authorization', 'csrfmiddlewaretoken',
+}
+
+
+def user_id(request):
+    """The user's id if authentication already ran; never triggers a query."""
+    user = getattr(request, 'user', None)
+    if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+        return None
+    return user.pk if user.is_authenticated else None
+
+
+def redact(value):
+    if isinstance(value, dict):
+        return {k: REDACTED if k.lower() in SENSITIVE_KEYS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
 
 class RequestLoggingMiddleware:
+    """
+    Log one structured line per request to the ``todo.requests`` logger.
+
+    Requests are sampled at REQUEST_LOG_SAMPLE_RATE; errors and requests
+    slower than REQUEST_LOG_SLOW_MS are always logged. Bodies are only
+    captured when REQUEST_LOG_CAPTURE_BODY is on, with secrets redacted and
+    the size capped. Handlers sit behind a queue (see todo.logs), so logging
+    never waits on disk.
+    """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.sample_rate = settings.REQUEST_LOG_SAMPLE_RATE
+        self.slow_ms = settings.REQUEST_LOG_SLOW_MS
+        self.capture_body = settings.REQUEST_LOG_CAPTURE_BODY
+        self.body_max_bytes = settings.REQUEST_LOG_BODY_MAX_BYTES
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        # Log request details
-        start_time = time.time()
-        logger.info(f"Request: {request.method} {request.path}")
-        logger.info(f"Headers: {dict(request.headers)}")
-        if request.body:
-            logger.info(f"Body: {request.body.decode('utf-8')}")
-
-        # Process the request
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.monotonic()
+        body = self.get_body(request)
         response = self.get_response(request)
+        self.log(request, response, start, body)
+        return response
 
-        # Log response details
-        duration = time.time() - start_time
-        logger.info(f"Response: {response.status_code} (took {duration:.2f}s)")
-        logger.info(f"Response Headers: {dict(response.headers)}")
-        
-        if hasattr(response, 'data'):
-            logger.info(f"Response Data: {response.data}")
-
+    async def __acall__(self, request):
+        start = time.monotonic()
+        body = self.get_body(request)
+        response = await self.get_response(request)
+        self.log(request, response, start, body)
         return response
 
     def process_exception(self, request, exception):
         logger.error(f"Exception occurred: {str(exception)}", exc_info=True)
-        return HttpResponseServerError() 
\ No newline at end of file
+        # Let Django build the response: Http404, PermissionDenied and
+        # SuspiciousOperation become 4xx, everything else a 500.
+        return None
+
+    def get_body(self, request):
+        if not self.capture_body or request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return None
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if not length:
+            return None
+        if length > self.body_max_bytes:
+            return f'<{length} bytes omitted>'
+
+        content_type = request.content_type or ''
+        try:
+            if content_type == 'application/json':
+                return redact(json.loads(request.body))
+            if content_type == 'application/x-www-form-urlencoded':
+                return redact(QueryDict(request.body).dict())
+        except ValueError:
+            return '<unparseable body>'
+        return f'<{length} bytes of {content_type or "unknown type"}>'
+
+    def log(self, request, response, start, body):
+        duration_ms = (time.monotonic() - start) * 1000
+        if not (
+            response.status_code >= 500
+            or duration_ms >= self.slow_ms
+            or self.sample_rate >= 1
+            or random.random() < self.sample_rate
+        ):
+            return
+
+        match = getattr(request, 'resolver_match', None)
+        payload = {
+            'method': request.method,
+            'path': request.path,
+            'route': match.url_name if match else None,
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 2),
+            'user_id': user_id(request),
+        }
+        if not response.streaming:
+            payload['bytes'] = len(response.content)
+        if body is not None:
+            payload['body'] = body
+        level = logging.ERROR if response.status_code >= 500 else logging.INFO
+        request_logger.log(level, 'request', extra={'payload': payload})
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status and SQL query count/time for every request,
+    labelled by URL name. Goes first in MIDDLEWARE so it times the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.monotonic()
+        stats = metrics.RequestStats()
+        token = metrics.current_request.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        metrics.observe(request, response, time.monotonic() - start, stats)
+        return response
+
+    async def __acall__(self, request):
+        start = time.monotonic()
+        stats = metrics.RequestStats()
+        token = metrics.current_request.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        metrics.observe(request, response, time.monotonic() - start, stats)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Give ``todo.routers.ReplicaRouter`` the current request, and pin the user
+    to the primary after a request that wrote. Does nothing without
+    DATABASE_REPLICAS.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = routers.RequestState(request)
+        token = routers.current_request.set(state)
+        try:
+            return self.get_response(request)
+        finally:
+            routers.current_request.reset(token)
+            state.finish()
+
+    async def __acall__(self, request):
+        state = routers.RequestState(request)
+        token = routers.current_request.set(state)
+        try:
+            return await self.get_response(request)
+        finally:
+            routers.current_request.reset(token)
+            await sync_to_async(state.finish)()
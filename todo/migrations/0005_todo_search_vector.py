@@ -0,0 +1,72 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:24
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Title matches rank above description matches. btree_gin lets user_id lead
+# both GIN indexes, so a search only visits the requesting user's postings.
+FORWARDS_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE EXTENSION IF NOT EXISTS btree_gin",
+    """
+    CREATE FUNCTION todo_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER todo_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description ON todo_todo
+    FOR EACH ROW EXECUTE FUNCTION todo_search_vector_update()
+    """,
+    """
+    UPDATE todo_todo SET search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    """,
+    "CREATE INDEX todo_user_search_idx ON todo_todo USING gin (user_id, search_vector)",
+    "CREATE INDEX todo_user_title_trgm_idx ON todo_todo USING gin (user_id, title gin_trgm_ops)",
+]
+
+BACKWARDS_SQL = [
+    "DROP INDEX IF EXISTS todo_user_title_trgm_idx",
+    "DROP INDEX IF EXISTS todo_user_search_idx",
+    "DROP TRIGGER IF EXISTS todo_search_vector_trigger ON todo_todo",
+    "DROP FUNCTION IF EXISTS todo_search_vector_update()",
+]
+
+
+def run_on_postgres(schema_editor, statements):
+    # Other databases keep the column NULL and search with LIKE instead.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def forwards(apps, schema_editor):
+    run_on_postgres(schema_editor, FORWARDS_SQL)
+
+
+def backwards(apps, schema_editor):
+    run_on_postgres(schema_editor, BACKWARDS_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo', '0004_todo_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todo',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.2 on 2026-10-18 19:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo', '0005_todo_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['user', '-created_at', '-id'], name='todo_user_done_created_idx'),
+        ),
+    ]
@@ -1,15 +1,260 @@
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models, IntegrityError, transaction, DEFAULT_DB_ALIAS
+from django.db.models import F
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+class TodoQuerySet(models.QuerySet):
+    def alive(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def tombstones(self):
+        return self.filter(deleted_at__isnull=False)
+
+
+def supports_returning(connection):
+    if connection.vendor == 'postgresql':
+        return True
+    return connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= (3, 35)
+
+
+class LiveTodoManager(models.Manager.from_queryset(TodoQuerySet)):
+    """
+    Default manager; hides soft-deleted todos from every view and leaves the
+    search vector, which only the database reads, out of the SELECT list.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().alive().defer('search_vector')
+
 
 class Todo(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Weighted title/description tsvector, kept current by a trigger on
+    # PostgreSQL (migration 0005) and always NULL on other databases.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # The user's TodoVersion at the write that last touched the row. It is
+    # taken under the version row lock in the writing transaction, so it
+    # grows in commit order per user; delta sync pages on (sync_seq, id).
+    sync_seq = models.PositiveBigIntegerField(default=0, db_default=0, editable=False)
+
+    objects = LiveTodoManager()
+    all_objects = TodoQuerySet.as_manager()
 
     def __str__(self):
         return self.title
 
+    @property
+    def revision(self):
+        """Changes with every write to the row; keys its cached HTML card."""
+        return f'{self.updated_at:%Y%m%d%H%M%S%f}'
+
+    def save(self, *args, **kwargs):
+        from .signals import todos_changed
+
+        with transaction.atomic():
+            self.sync_seq = todos_changed(self.user_id)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'sync_seq'}
+            super().save(*args, **kwargs)
+
+    def soft_delete(self):
+        """Leave a tombstone so syncing clients learn about the delete."""
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at', 'updated_at'])
+
+    async def asoft_delete(self):
+        self.deleted_at = timezone.now()
+        await self.asave(update_fields=['deleted_at', 'updated_at'])
+
+    def assign(self, values):
+        """Set the fields in ``values`` that differ; return their names."""
+        changed = [name for name, value in values.items() if getattr(self, name) != value]
+        for name in changed:
+            setattr(self, name, values[name])
+        return changed
+
+    @classmethod
+    def toggle(cls, user_id, pk):
+        """
+        Flip ``completed`` on one of ``user_id``'s live todos in a single
+        ``UPDATE ... SET completed = NOT completed ... RETURNING`` and return
+        the updated todo, or None if there is no such todo. Two concurrent
+        toggles each flip once; neither can overwrite the other's write.
+        """
+        return cls._update_returning(user_id, pk, 'completed = NOT completed')
+
+    @classmethod
+    def set_completed(cls, user_id, pk, completed):
+        """
+        Set ``completed`` with one column-targeted UPDATE that only matches
+        when the value actually changes. Returns ``(todo, changed)``; a no-op
+        writes nothing and leaves the version (and so the ETag) alone.
+        """
+        todo = cls._update_returning(user_id, pk, 'completed = %s', [completed],
+                                     where='completed <> %s', where_params=[completed])
+        if todo is not None:
+            return todo, True
+        return cls.objects.filter(user_id=user_id, pk=pk).first(), False
+
+    @classmethod
+    def _update_returning(cls, user_id, pk, assignment, params=(), where=None, where_params=(),
+                          using=DEFAULT_DB_ALIAS):
+        from .signals import todos_changed
+
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        with transaction.atomic(using=using):
+            # The sequence number is taken first, under the version row lock;
+            # see sync_seq. update() skips auto_now, so updated_at is set here.
+            sql = (
+                f'UPDATE {qn(cls._meta.db_table)} SET {assignment}, {qn("updated_at")} = %s, '
+                f'{qn("sync_seq")} = %s '
+                f'WHERE {qn("id")} = %s AND {qn("user_id")} = %s AND {qn("deleted_at")} IS NULL'
+            )
+            params = [*params, timezone.now(), todos_changed(user_id), pk, user_id]
+            if where:
+                sql += f' AND {where}'
+                params += where_params
+            if supports_returning(connection):
+                columns = [field.column for field in cls._meta.concrete_fields if field.name != 'search_vector']
+                sql += f' RETURNING {", ".join(qn(column) for column in columns)}'
+                # raw() applies the field converters (booleans and datetimes on
+                # SQLite) and builds the instance.
+                todo = next(iter(cls.objects.raw(sql, params).using(using)), None)
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    changed = cursor.rowcount
+                todo = cls.objects.using(using).filter(user_id=user_id, pk=pk).first() if changed else None
+            if todo is None:
+                # Nothing was written; undo the version bump so ETags stay.
+                transaction.set_rollback(True, using=using)
+        return todo
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Every list query is "this user's todos, newest first", and the
+            # API paginates on (created_at, id), so one index serves both the
+            # filter and the sort.
+            models.Index(fields=['user', '-created_at', '-id'], name='todo_user_created_idx'),
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                name='todo_user_open_created_idx',
+                condition=models.Q(completed=False),
+            ),
+            # ?completed=true; with the open index above, either value of the
+            # filter is one range scan in list order.
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                name='todo_user_done_created_idx',
+                condition=models.Q(completed=True),
+            ),
+            # ?ordering=updated_at / -updated_at on the list endpoint.
+            models.Index(fields=['user', 'updated_at', 'id'], name='todo_user_updated_idx'),
+            # Delta sync walks each user's changes in (sync_seq, id) order,
+            # tombstones included.
+            models.Index(fields=['user', 'sync_seq', 'id'], name='todo_user_sync_seq_idx'),
+        ]
+
+
+class TodoVersion(models.Model):
+    """
+    Per-user change counter for todos.
+
+    Every write to a user's todos bumps it, so it can be turned into an ETag
+    and checked without touching the todo table.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='todo_version')
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.user_id}@{self.version}'
+
+    @classmethod
+    def current(cls, user_id, lock=False):
+        queryset = cls.objects.filter(user_id=user_id)
+        if lock:
+            queryset = queryset.select_for_update()
+        return queryset.values_list('version', flat=True).first() or 0
+
+    @classmethod
+    async def acurrent(cls, user_id):
+        return await cls.objects.filter(user_id=user_id).values_list('version', flat=True).afirst() or 0
+
+    @classmethod
+    def bump(cls, user_id):
+        """
+        Increment the user's version and return the new value. Call inside
+        the transaction that writes the todos: the row stays locked until it
+        commits, so the user's writers take versions in commit order.
+        """
+        version = cls._increment(user_id)
+        if version is not None:
+            return version
+        try:
+            with transaction.atomic():
+                cls.objects.create(user_id=user_id, version=1)
+            return 1
+        except IntegrityError:
+            # Another request created the row first.
+            return cls._increment(user_id)
+
+    @classmethod
+    def _increment(cls, user_id):
+        """The incremented version, or None if the user has no row yet."""
+        connection = connections[DEFAULT_DB_ALIAS]
+        if not supports_returning(connection):
+            if cls.objects.filter(user_id=user_id).update(version=F('version') + 1):
+                return cls.current(user_id)
+            return None
+        qn = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {qn(cls._meta.db_table)} SET {qn("version")} = {qn("version")} + 1 '
+                f'WHERE {qn("user_id")} = %s RETURNING {qn("version")}',
+                [user_id],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+
+class Task(models.Model):
+    """
+    A background job waiting for ``manage.py run_tasks``; see todo.tasks.
+
+    Rows are deleted once their task succeeds. While a worker runs one,
+    ``run_at`` holds the end of its lease.
+    """
+    PENDING = 'pending'
+    FAILED = 'failed'
+    STATUSES = [(PENDING, 'Pending'), (FAILED, 'Failed')]
+
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField()
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.name}#{self.pk}'
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            # Workers poll for the oldest due pending tasks; failed rows stay
+            # for inspection but never need scanning.
+            models.Index(fields=['run_at', 'id'], name='task_pending_run_at_idx',
+                         condition=models.Q(status='pending')),
+        ]
@@ -0,0 +1,90 @@
+"""
+Read-replica routing with read-your-writes pinning.
+
+During a request, reads of the todo app's models go to one of
+``DATABASE_REPLICAS``; everything else, all writes, and any read inside a
+transaction go to ``default``. A request that writes marks its user as
+pinned for ``DATABASE_REPLICA_PIN_SECONDS`` (in the default cache, so use a
+shared backend with several workers; ``manage.py check`` warns about a
+per-process one), and that user's reads stay on the primary until
+replication has caught up: a toggle never appears to revert.
+
+Outside requests (management commands, the shell) everything uses the
+primary.
+"""
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from . import middleware
+
+REPLICA_APPS = {'todo'}
+
+current_request = ContextVar('todo_replica_request', default=None)
+
+
+@checks.register(checks.Tags.caches, checks.Tags.database)
+def check_pin_cache(app_configs, **kwargs):
+    """Pins in a per-process cache are invisible to the worker that reads next."""
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DATABASE_REPLICAS and backend.endswith('LocMemCache'):
+        return [checks.Warning(
+            'Read replicas are configured but the default cache is per-process (LocMemCache).',
+            hint='Read-your-writes pins only reach the worker that wrote; set CACHE_BACKEND to a '
+                 'shared backend such as Redis or Memcached.',
+            id='todo.W001',
+        )]
+    return []
+
+
+def pin_key(user_id):
+    return f'db:pinned:{user_id}'
+
+
+class RequestState:
+    __slots__ = ('request', 'replica', 'wrote', 'pinned')
+
+    def __init__(self, request):
+        self.request = request
+        self.replica = random.choice(settings.DATABASE_REPLICAS)
+        self.wrote = False
+        self.pinned = None
+
+    def use_primary(self):
+        if self.wrote:
+            return True
+        if self.pinned is None:
+            # The user is only known once authentication has run; until then
+            # (and for anonymous requests) nothing can be pinned.
+            uid = middleware.user_id(self.request)
+            if uid is None:
+                return False
+            self.pinned = cache.get(pin_key(uid)) is not None
+        return self.pinned
+
+    def finish(self):
+        uid = middleware.user_id(self.request)
+        if self.wrote and uid is not None:
+            cache.set(pin_key(uid), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = current_request.get()
+        if state is None or model._meta.app_label not in REPLICA_APPS:
+            return None
+        if state.use_primary() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = current_request.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
@@ -0,0 +1,39 @@
+"""
+Todo search for ``?q=`` on the HTML and API list views.
+
+On PostgreSQL a query matches either the stored ``search_vector`` (English
+stemming, websearch syntax such as ``"exact phrase"`` and ``-word``) or the
+title by trigram similarity, so small typos still find the todo. Results are
+ordered by text rank plus title similarity. Both predicates are served by the
+per-user GIN indexes from migration 0005.
+
+Other databases fall back to a case-insensitive substring match on every word,
+newest first. That scans the user's todos, which is fine for tests and small
+lists.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connections
+from django.db.models import F, Q
+
+SEARCH_CONFIG = 'english'
+MAX_QUERY_LENGTH = 200
+
+
+def clean_query(value):
+    """The stripped search string from a ``q`` parameter, or ''."""
+    return (value or '').strip()[:MAX_QUERY_LENGTH]
+
+
+def search(queryset, q):
+    """Filter ``queryset`` to todos matching ``q``, best matches first."""
+    if connections[queryset.db].vendor == 'postgresql':
+        query = SearchQuery(q, config=SEARCH_CONFIG, search_type='websearch')
+        return (
+            queryset
+            .filter(Q(search_vector=query) | Q(title__trigram_similar=q))
+            .annotate(rank=SearchRank(F('search_vector'), query) + TrigramSimilarity('title', q))
+            .order_by('-rank', '-created_at', '-id')
+        )
+    for term in q.split():
+        queryset = queryset.filter(Q(title__icontains=term) | Q(description__icontains=term))
+    return queryset.order_by('-created_at', '-id')
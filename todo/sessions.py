@@ -0,0 +1,25 @@
+"""
+Signed-cookie session engine (``SESSION_MODE=signed_cookies``).
+
+Django's signed_cookies backend with a size guard: a browser silently
+discards a cookie over about 4KB, which looks to the user like a random
+logout. Sessions here only hold the login, so hitting the limit means
+something started storing data it shouldn't; fail loudly instead.
+"""
+from django.conf import settings
+from django.contrib.sessions.backends import signed_cookies
+
+
+class SessionTooLarge(ValueError):
+    pass
+
+
+class SessionStore(signed_cookies.SessionStore):
+    def _get_session_key(self):
+        key = super()._get_session_key()
+        if len(key) > settings.SESSION_COOKIE_MAX_BYTES:
+            raise SessionTooLarge(
+                f'Signed session cookie is {len(key)} bytes, over SESSION_COOKIE_MAX_BYTES '
+                f'({settings.SESSION_COOKIE_MAX_BYTES}); keys: {sorted(self._session)}'
+            )
+        return key
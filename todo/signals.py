@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from . import cache
+from .api.authentication import forget_user
+from .models import Todo, TodoVersion
+
+
+def todos_changed(user_id):
+    """
+    Record a write to ``user_id``'s todos and return the sequence number to
+    stamp on the written rows (``Todo.sync_seq``). Call it in the writing
+    transaction, before the write; ``Todo.save()`` does, bulk statements
+    must do it themselves.
+    """
+    version = TodoVersion.bump(user_id)
+    cache.invalidate(user_id)
+    return version
+
+
+@receiver(post_delete, sender=Todo)
+def todo_deleted(sender, instance, origin=None, **kwargs):
+    # A cascade from deleting the user takes their TodoVersion row with it;
+    # bumping here would recreate it for a user that no longer exists.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if issubclass(origin_model, get_user_model()):
+        return
+    todos_changed(instance.user_id)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_saved_or_deleted(sender, instance, **kwargs):
+    forget_user(instance.pk)
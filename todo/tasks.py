@@ -0,0 +1,206 @@
+"""
+Database-backed background tasks for slow side effects such as email.
+
+``some_task.enqueue(**kwargs)`` inserts a Task row in the caller's own
+transaction, so a task is queued exactly when the write that caused it
+commits, and returns in about a millisecond. ``manage.py run_tasks`` claims
+due rows with ``SELECT ... FOR UPDATE SKIP LOCKED``: any number of workers
+can poll the table without blocking each other or taking the same row.
+Claiming pushes ``run_at`` out by TASK_LEASE_SECONDS and commits; the task
+then runs on a thread pool outside any transaction. Success deletes the row.
+Failure reschedules it with exponential backoff until ``max_attempts``, after
+which it stays as ``failed``, with its arguments redacted, for inspection in
+the admin.
+
+A worker that dies mid-task leaves the row to be claimed again when its lease
+runs out, so tasks must be safe to run twice. Keyword arguments are stored as
+JSON: pass ids and strings, not model instances.
+"""
+import gzip
+import io
+import json
+import logging
+import random
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+from functools import partial
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMessage
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+REGISTRY = {}
+REDACTED = '[redacted]'
+
+
+def task(func=None, *, max_attempts=None):
+    """
+    Register ``func`` as a task named after its module and function, and give
+    it an ``enqueue(**kwargs)`` method.
+    """
+    def register(func):
+        name = f'{func.__module__}.{func.__qualname__}'
+        REGISTRY[name] = func
+        func.task_name = name
+        func.max_attempts = max_attempts
+        func.enqueue = partial(enqueue, name)
+        return func
+    return register(func) if func is not None else register
+
+
+def enqueue(name, countdown=0, **kwargs):
+    """Queue task ``name`` to run ``countdown`` seconds from now; returns the Task."""
+    try:
+        func = REGISTRY[name]
+    except KeyError:
+        raise ValueError(f'Unknown task {name!r}')
+    if settings.TASKS_EAGER:
+        # Round-trip through JSON so eager runs fail on the same arguments
+        # a worker would.
+        kwargs = json.loads(json.dumps(kwargs))
+        transaction.on_commit(lambda: func(**kwargs))
+        return None
+    return Task.objects.create(
+        name=name,
+        kwargs=kwargs,
+        max_attempts=func.max_attempts or settings.TASK_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=countdown),
+    )
+
+
+def backoff(attempts):
+    """Seconds to wait before retrying after the ``attempts``-th failure."""
+    delay = min(settings.TASK_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1), settings.TASK_RETRY_MAX_BACKOFF_SECONDS)
+    # Jitter, so tasks that failed together on a dependency don't retry in
+    # lockstep.
+    return delay * random.uniform(0.5, 1)
+
+
+def claim(limit):
+    """Lease up to ``limit`` due tasks to this worker, oldest first."""
+    now = timezone.now()
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.PENDING, run_at__lte=now)
+            .order_by('run_at', 'id')[:limit]
+        )
+        if tasks:
+            Task.objects.filter(pk__in=[task.pk for task in tasks]).update(
+                attempts=F('attempts') + 1, run_at=now + timedelta(seconds=settings.TASK_LEASE_SECONDS))
+    for task in tasks:
+        task.attempts += 1
+    return tasks
+
+
+def run(task):
+    """Run one claimed task and record the outcome; returns True on success."""
+    # Each pool thread has its own connection; treat a task like a request.
+    close_old_connections()
+    try:
+        func = REGISTRY.get(task.name)
+        if func is None:
+            raise LookupError(f'Unknown task {task.name!r}')
+        func(**task.kwargs)
+    except Exception as exc:
+        error = traceback.format_exc()
+        if isinstance(exc, LookupError) or task.attempts >= task.max_attempts:
+            logger.exception('Task %s failed permanently after %d attempt(s)', task, task.attempts)
+            # Failed rows are kept for inspection; their arguments may be
+            # personal data, so only the names are.
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.FAILED, last_error=error, kwargs={name: REDACTED for name in task.kwargs})
+        else:
+            delay = backoff(task.attempts)
+            logger.warning('Task %s failed (attempt %d of %d), retrying in %.0fs: %s',
+                           task, task.attempts, task.max_attempts, delay, exc)
+            Task.objects.filter(pk=task.pk).update(
+                run_at=timezone.now() + timedelta(seconds=delay), last_error=error)
+        return False
+    else:
+        Task.objects.filter(pk=task.pk).delete()
+        return True
+    finally:
+        close_old_connections()
+
+
+def work(threads, poll_interval, stop, burst=False):
+    """
+    Claim and run tasks on ``threads`` threads until ``stop`` (a
+    threading.Event) is set, or with ``burst`` until nothing is due. Tasks
+    already running are finished before returning. Returns
+    ``(succeeded, failed)``.
+    """
+    outcomes = []
+    running = set()
+    with ThreadPoolExecutor(threads, thread_name_prefix='task') as pool:
+        while not stop.is_set():
+            close_old_connections()
+            free = threads - len(running)
+            claimed = claim(free) if free else []
+            running.update(pool.submit(run, task) for task in claimed)
+            if not running:
+                if burst:
+                    break
+                stop.wait(poll_interval)
+                continue
+            # Wake when a slot frees up, or after poll_interval to pick up
+            # newly due tasks for the free ones.
+            finished, running = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            outcomes.extend(future.result() for future in finished)
+    outcomes.extend(future.result() for future in running)
+    succeeded = sum(outcomes)
+    return succeeded, len(outcomes) - succeeded
+
+
+@task
+def send_password_reset(user_id, domain, site_name, use_https, subject_template_name, email_template_name,
+                        html_email_template_name=None, from_email=None, extra_email_context=None):
+    """
+    PasswordResetForm.save() for one user, run in the worker: the token is
+    made here, so the link only ever exists in the email itself.
+    """
+    from django.contrib.auth.forms import PasswordResetForm
+
+    user = get_user_model()._default_manager.filter(pk=user_id, is_active=True).first()
+    if user is None or not user.has_usable_password():
+        return
+    email = getattr(user, user.get_email_field_name())
+    context = {
+        'email': email,
+        'domain': domain,
+        'site_name': site_name,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'user': user,
+        'token': default_token_generator.make_token(user),
+        'protocol': 'https' if use_https else 'http',
+        **(extra_email_context or {}),
+    }
+    PasswordResetForm().send_mail(subject_template_name, email_template_name, context, from_email, email,
+                                  html_email_template_name=html_email_template_name)
+
+
+@task
+def email_export(user_id, format):
+    """Email a user all their todos as a gzipped NDJSON or CSV attachment."""
+    from .api import export
+
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is None or not user.email:
+        return
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb') as file:
+        for chunk in export.stream(user, format):
+            file.write(chunk)
+    message = EmailMessage('Your todo export', 'Your todos are attached.', to=[user.email])
+    message.attach(f'todos.{format}.gz', buffer.getvalue(), 'application/gzip')
+    message.send()
@@ -1,3 +1,152 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from .api.sync import compact_tombstones
+from .routers import check_pin_cache
+from . import cache as todo_cache
+from .models import Todo, TodoVersion
 
-# Create your tests here.
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TodoListNotFoundTests(TestCase):
+    """The HTML views answer 404, not 500, with the full middleware stack."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='secret-pass-1')
+        cls.other = User.objects.create_user('bob', password='secret-pass-2')
+        cls.todo = Todo.objects.create(user=cls.other, title="Bob's todo")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('todo_list'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_toggle_missing_todo(self):
+        response = self.client.post(reverse('todo_toggle_complete', args=[self.todo.pk + 1000]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_toggle_other_users_todo(self):
+        response = self.client.post(reverse('todo_toggle_complete', args=[self.todo.pk]))
+        self.assertEqual(response.status_code, 404)
+        self.todo.refresh_from_db()
+        self.assertFalse(self.todo.completed)
+
+    def test_update_missing_todo(self):
+        response = self.client.get(reverse('todo_update', args=[self.todo.pk + 1000]))
+        self.assertEqual(response.status_code, 404)
+
+
+class CompactTombstonesTests(TestCase):
+    def test_compaction_leaves_versions_alone(self):
+        user = User.objects.create_user('carol', password='secret-pass-3')
+        for n in range(20):
+            Todo.objects.create(user=user, title=f'Todo {n}').soft_delete()
+        live = Todo.objects.create(user=user, title='Keep me')
+        Todo.all_objects.tombstones().update(deleted_at=timezone.now() - timedelta(days=365))
+        version = TodoVersion.current(user.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(compact_tombstones(), 20)
+
+        self.assertEqual(TodoVersion.current(user.pk), version)
+        self.assertEqual(list(Todo.all_objects.values_list('pk', flat=True)), [live.pk])
+
+
+class TodoBulkValidationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('dave', password='secret-pass-4')
+        cls.todo = Todo.objects.create(user=cls.user, title='Existing')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.url = reverse('api-todo-bulk')
+
+    def test_body_must_be_an_object(self):
+        for body in ([{'op': 'create', 'data': {'title': 'x'}}], 'operations', 42):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'error': "'operations' must be a non-empty list"})
+
+    def test_malformed_operations_write_nothing(self):
+        version = TodoVersion.current(self.user.pk)
+        response = self.client.post(self.url, {'operations': [
+            'not an object',
+            {'op': 'explode'},
+            {'op': 'toggle'},
+            {'op': 'update', 'id': self.todo.pk, 'data': 'not a dict'},
+            {'op': 'create', 'data': {'title': 'Valid'}},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        statuses = [result['status'] for result in response.json()['results']]
+        self.assertEqual(statuses, [400, 400, 400, 400, 424])
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 1)
+        self.assertEqual(TodoVersion.current(self.user.pk), version)
+
+    def test_valid_batch(self):
+        response = self.client.post(self.url, {'operations': [
+            {'op': 'create', 'data': {'title': 'New'}},
+            {'op': 'toggle', 'id': self.todo.pk},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['status'] for result in response.json()['results']], [201, 200])
+        self.todo.refresh_from_db()
+        self.assertTrue(self.todo.completed)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class FirstPageCacheTests(APITestCase):
+    """A write seen by another worker leaves this one's cache entry behind."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('erin', password='secret-pass-5')
+        cls.todo = Todo.objects.create(user=cls.user, title='Before')
+
+    def setUp(self):
+        todo_cache.get_cache().clear()
+
+    def write_elsewhere(self):
+        # What another process's write looks like from here: the row and
+        # the version change, but this cache is not invalidated.
+        with transaction.atomic():
+            seq = TodoVersion.bump(self.user.pk)
+            Todo.objects.filter(pk=self.todo.pk).update(
+                title='After', sync_seq=seq, updated_at=timezone.now())
+
+    def test_api_first_page(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('api-todo-list')
+        self.assertEqual(self.client.get(url).json()['results'][0]['title'], 'Before')
+        self.write_elsewhere()
+        self.assertEqual(self.client.get(url).json()['results'][0]['title'], 'After')
+
+    def test_html_list(self):
+        self.client.force_login(self.user)
+        self.assertContains(self.client.get(reverse('todo_list')), 'Before')
+        self.write_elsewhere()
+        self.assertContains(self.client.get(reverse('todo_list')), 'After')
+
+
+class PinCacheCheckTests(TestCase):
+    locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+
+    def test_replicas_with_locmem_cache(self):
+        with self.settings(DATABASE_REPLICAS=['replica_0'], CACHES=self.locmem):
+            self.assertEqual([error.id for error in check_pin_cache(None)], ['todo.W001'])
+
+    def test_shared_cache_or_no_replicas(self):
+        with self.settings(DATABASE_REPLICAS=['replica_0'], CACHES=self.redis):
+            self.assertEqual(check_pin_cache(None), [])
+        with self.settings(DATABASE_REPLICAS=[], CACHES=self.locmem):
+            self.assertEqual(check_pin_cache(None), [])
@@ -1,6 +1,7 @@
 from django.urls import path
 from django.contrib.auth import views as auth_views
 from . import views
+from .forms import QueuedPasswordResetForm
 
 urlpatterns = [
     path('', views.todo_list, name='todo_list'),
@@ -13,6 +14,7 @@ urlpatterns = [
     path('todo/<int:pk>/toggle/', views.todo_toggle_complete, name='todo_toggle_complete'),
     # Password Reset URLs
     path('password-reset/', auth_views.PasswordResetView.as_view(
+        form_class=QueuedPasswordResetForm,
         template_name='todo/password_reset.html',
         email_template_name='todo/password_reset_email.html',
         subject_template_name='todo/password_reset_subject.txt'
@@ -0,0 +1,42 @@
+import hashlib
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from .models import TodoVersion
+
+
+def make_etag(user_id, version, *parts):
+    """Strong ETag for a user's todo data at ``version``, scoped by ``parts``."""
+    scope = hashlib.md5('|'.join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()[:16]
+    return quote_etag(f'{user_id}-{version}-{scope}')
+
+
+def request_etag(request, lock=False, version=None):
+    """ETag for whatever ``request`` asks for, based on the current version."""
+    if version is None:
+        version = TodoVersion.current(request.user.pk, lock=lock)
+    return make_etag(request.user.pk, version, request.path, request.META.get('QUERY_STRING', ''))
+
+
+def check_preconditions(request, etag):
+    """Return a 304/412 response if ``If-None-Match``/``If-Match`` say so."""
+    return get_conditional_response(request, etag=etag)
+
+
+def set_etag(response, etag):
+    response['ETag'] = etag
+    # Clients may keep the body but must revalidate; the data is per user.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Authorization', 'Cookie'))
+    return response
+
+
+def html_list_etag(request):
+    """
+    ETag for the server-rendered list, or None when the page can't be reused:
+    pending flash messages and the embedded CSRF token are part of the page.
+    """
+    if not request.user.is_authenticated or len(messages.get_messages(request)):
+        return None
+    version = TodoVersion.current(request.user.pk)
+    return make_etag(request.user.pk, version, request.get_full_path(), request.META.get('CSRF_COOKIE', ''))
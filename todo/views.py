@@ -3,9 +3,19 @@ from django.contrib.auth import login, authenticate
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
-from .models import Todo
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.http import urlencode
+from django.views.decorators.http import condition, require_POST
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from . import cache as todo_cache, search
+from .api.pagination import TodoCursorPagination, TodoSearchPagination
+from .models import Todo, TodoVersion
 from .forms import TodoForm, CustomUserCreationForm
+from .versioning import html_list_etag
 
 def signup(request):
     if request.method == 'POST':
@@ -19,9 +29,59 @@ def signup(request):
     return render(request, 'todo/signup.html', {'form': form})
 
 @login_required
+@condition(etag_func=html_list_etag)
 def todo_list(request):
-    todos = Todo.objects.filter(user=request.user)
-    return render(request, 'todo/todo_list.html', {'todos': todos})
+    q = search.clean_query(request.GET.get('q'))
+    if q:
+        return todo_search(request, q)
+    # Keyset pages like the API: rendering cost depends on the page size,
+    # not on how many todos the user has.
+    paginator = TodoCursorPagination()
+    try:
+        queryset = paginator.prepare_queryset(Todo.objects.filter(user=request.user), Request(request))
+    except NotFound:
+        raise Http404('Invalid page.')
+    # Only the default first page is cached, as page_size + 1 rows so the
+    # paginator can tell whether a next page exists.
+    # Entries are only trusted at the current version; see todo.cache.
+    first_page = not request.GET
+    rows = None
+    if first_page:
+        version = TodoVersion.current(request.user.pk)
+        cached = todo_cache.get_html_list(request.user.pk)
+        if cached and cached[0] == version:
+            rows = cached[1]
+    if rows is None:
+        rows = list(queryset[:paginator.page_size + 1])
+        if first_page:
+            todo_cache.set_html_list(request.user.pk, version, rows)
+    todos = paginator.set_page(rows)
+    return render(request, 'todo/todo_list.html', {
+        'todos': todos,
+        'previous_url': paginator.get_previous_link(),
+        'next_url': paginator.get_next_link(),
+        'card_cache_timeout': settings.TODO_CARD_CACHE_TIMEOUT,
+    })
+
+def todo_search(request, q):
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    page_size = TodoSearchPagination.page_size
+    offset = (page - 1) * page_size
+    results = list(search.search(Todo.objects.filter(user=request.user), q)[offset:offset + page_size + 1])
+    return render(request, 'todo/todo_list.html', {
+        'todos': results[:page_size],
+        'q': q,
+        'previous_url': search_page_url(q, page - 1) if page > 1 else None,
+        'next_url': search_page_url(q, page + 1) if len(results) > page_size else None,
+        'card_cache_timeout': settings.TODO_CARD_CACHE_TIMEOUT,
+    })
+
+def search_page_url(q, page):
+    params = {'q': q, 'page': page} if page > 1 else {'q': q}
+    return f"{reverse('todo_list')}?{urlencode(params)}"
 
 @login_required
 def todo_create(request):
@@ -43,7 +103,8 @@ def todo_update(request, pk):
     if request.method == 'POST':
         form = TodoForm(request.POST, instance=todo)
         if form.is_valid():
-            form.save()
+            if form.has_changed():
+                form.save(commit=False).save(update_fields=[*form.changed_data, 'updated_at'])
             messages.success(request, 'Todo updated successfully!')
             return redirect('todo_list')
     else:
@@ -54,20 +115,27 @@ def todo_update(request, pk):
 def todo_delete(request, pk):
     todo = get_object_or_404(Todo, pk=pk, user=request.user)
     if request.method == 'POST':
-        todo.delete()
+        todo.soft_delete()
         messages.success(request, 'Todo deleted successfully!')
         return redirect('todo_list')
     return render(request, 'todo/todo_confirm_delete.html', {'todo': todo})
 
 @login_required
+@require_POST
 def todo_toggle_complete(request, pk):
-    todo = get_object_or_404(Todo, pk=pk, user=request.user)
-    todo.completed = not todo.completed
-    todo.save()
+    todo = Todo.toggle(request.user.pk, pk)
+    if todo is None:
+        raise Http404('No Todo matches the given query.')
+    message = 'Marked as completed' if todo.completed else 'Marked as incomplete'
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        # The page swaps in this one card instead of reloading the list.
         return JsonResponse({
             'completed': todo.completed,
-            'message': 'Marked as completed' if todo.completed else 'Marked as incomplete'
+            'message': message,
+            'html': render_to_string('todo/todo_card.html', {
+                'todo': todo,
+                'card_cache_timeout': settings.TODO_CARD_CACHE_TIMEOUT,
+            }, request=request),
         })
-    messages.success(request, 'Marked as completed' if todo.completed else 'Marked as incomplete')
+    messages.success(request, message)
     return redirect('todo_list')
@@ -0,0 +1,59 @@
+"""
+CPU and memory limits of the current container, for sizing gunicorn.
+
+``os.cpu_count()`` reports the host's CPUs, not the container's share, and
+nothing in the standard library reports a memory limit. Both cgroup v2 and
+v1 layouts are read; no limit found means the host's resources apply.
+Imported by gunicorn.conf.py before Django, so no Django imports here.
+"""
+import math
+import os
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+# cgroup v1 reports "no limit" as a huge page-aligned number.
+UNLIMITED_MEMORY = 1 << 60
+
+
+def _read(*parts):
+    try:
+        with open(os.path.join(CGROUP_ROOT, *parts)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_quota():
+    """The CFS quota in CPUs (may be fractional), or None if unlimited."""
+    v2 = _read('cpu.max')
+    if v2 is not None:
+        quota, _, period = v2.partition(' ')
+        if quota == 'max':
+            return None
+        return int(quota) / int(period or 100000)
+    quota, period = _read('cpu', 'cpu.cfs_quota_us'), _read('cpu', 'cpu.cfs_period_us')
+    if quota is None or period is None or int(quota) < 0:
+        return None
+    return int(quota) / int(period)
+
+
+def available_cpus():
+    """CPUs this process may use: affinity mask, capped by the cgroup quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+def memory_limit():
+    """The cgroup memory limit in bytes, or None if unlimited."""
+    v2 = _read('memory.max')
+    if v2 is not None:
+        return None if v2 == 'max' else int(v2)
+    v1 = _read('memory', 'memory.limit_in_bytes')
+    if v1 is None or int(v1) >= UNLIMITED_MEMORY:
+        return None
+    return int(v1)
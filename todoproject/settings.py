@@ -39,6 +39,24 @@ CSRF_TRUSTED_ORIGINS = settings.csrf_trusted_origins
 
 # Application definition
 
+# Apps and middleware only the server-rendered pages and admin need; left
+# out when API_ONLY is set, so API workers boot and serve without them.
+HTML_APPS = [
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'crispy_forms',
+    'crispy_bootstrap5',
+]
+HTML_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+]
+
+API_ONLY = settings.API_ONLY
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -46,6 +64,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'todo.apps.TodoConfig',
     'crispy_forms',
     'crispy_bootstrap5',
@@ -55,6 +74,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'todo.middleware.MetricsMiddleware',
+    'todo.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -67,16 +88,33 @@ MIDDLEWARE = [
     'todo.middleware.RequestLoggingMiddleware',
 ]
 
+if API_ONLY:
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in HTML_APPS]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in HTML_MIDDLEWARE]
+
 # CORS settings are imported from cors.py
 
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
+        'todo.api.authentication.StatelessJWTAuthentication'
+        if settings.JWT_STATELESS_AUTH else
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson drop-ins for DRF's JSON renderer/parser; same bytes, less CPU.
+    # The browsable API needs templates and static files, which API_ONLY
+    # workers don't load.
+    'DEFAULT_RENDERER_CLASSES': (
+        'todo.api.renderers.ORJSONRenderer',
+    ) + (() if API_ONLY else ('rest_framework.renderers.BrowsableAPIRenderer',)),
+    'DEFAULT_PARSER_CLASSES': (
+        'todo.api.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 # JWT settings
@@ -95,25 +133,46 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Stateless JWT auth (todo/api/authentication.py): how long a user's
+# active/staff flags are cached before a deactivation takes effect everywhere.
+JWT_STATELESS_AUTH = settings.JWT_STATELESS_AUTH
+JWT_USER_STATE_TTL = settings.JWT_USER_STATE_TTL
+
+# Delta sync: how long soft-deleted todos are kept before compaction.
+# Sync tokens older than this are rejected and the client does a full refresh.
+TODO_SYNC_TOMBSTONE_RETENTION_DAYS = settings.SYNC_TOMBSTONE_RETENTION_DAYS
+
 ROOT_URLCONF = 'todoproject.urls'
 
+template_loaders = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
+            ] + ([] if API_ONLY else ['django.contrib.messages.context_processors.messages']),
+            # Compile each template once per process in production; in
+            # development, read templates from disk on every render.
+            'loaders': template_loaders if DEBUG else [
+                ('django.template.loaders.cached.Loader', template_loaders),
             ],
         },
     },
 ]
 
 WSGI_APPLICATION = 'todoproject.wsgi.application'
+ASGI_APPLICATION = 'todoproject.asgi.application'
+
+# Route the todo API to the async views in todo/api/async_views.py
+ASYNC_API = settings.ASYNC_API
 
 
 # Database
@@ -121,14 +180,70 @@ WSGI_APPLICATION = 'todoproject.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'ENGINE': 'django.db.backends.postgresql',
         'NAME': settings.DB_NAME,
         'USER': settings.DB_USER,
         'PASSWORD': settings.DB_PASSWORD,
         'HOST': settings.DB_HOST,
         'PORT': settings.DB_PORT,
+        # Async views run queries in executor threads, where Django can't
+        # close a persistent connection at the end of the request.
+        'CONN_MAX_AGE': 0 if settings.ASYNC_API else settings.DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': settings.DB_CONN_HEALTH_CHECKS,
+        'OPTIONS': {},
+    }
+}
+
+# Read replicas (todo/routers.py): todo reads go to a replica, writes and
+# recently-writing users to the primary. Tests read the primary.
+DATABASE_REPLICAS = []
+for index, host in enumerate(settings.db_replica_hosts):
+    replica_host, _, replica_port = host.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or settings.DB_PORT,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+DATABASE_ROUTERS = ['todo.routers.ReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = settings.DB_REPLICA_PIN_SECONDS
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': settings.CACHE_BACKEND,
+        'LOCATION': settings.CACHE_LOCATION,
     }
 }
+if settings.CACHE_BACKEND.endswith('LocMemCache'):
+    # Keep the per-process cache bounded; shared backends size themselves.
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': settings.CACHE_MAX_ENTRIES}
+
+# Read-through cache for each user's todo list (see todo/cache.py)
+TODO_LIST_CACHE_ALIAS = 'default'
+TODO_LIST_CACHE_TIMEOUT = settings.TODO_LIST_CACHE_TIMEOUT
+# Per-todo HTML fragments in the server-rendered list (todo/todo_card.html)
+TODO_CARD_CACHE_TIMEOUT = settings.TODO_CARD_CACHE_TIMEOUT
+
+
+# Sessions
+# https://docs.djangoproject.com/en/5.1/topics/http/sessions/
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'todo.sessions',
+}
+SESSION_ENGINE = SESSION_ENGINES[settings.SESSION_MODE]
+SESSION_COOKIE_MAX_BYTES = settings.SESSION_COOKIE_MAX_BYTES
+
+# Flash messages ride in their own cookie, so showing one never touches the
+# session (or, with SESSION_MODE=db, the database).
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
 
 
 # Password validation
@@ -210,7 +325,29 @@ EMAIL_USE_TLS = settings.EMAIL_USE_TLS
 EMAIL_HOST_USER = settings.EMAIL_HOST_USER
 EMAIL_HOST_PASSWORD = settings.EMAIL_HOST_PASSWORD
 
+# Background tasks (todo.tasks, manage.py run_tasks)
+TASKS_EAGER = settings.TASKS_EAGER
+TASK_WORKER_THREADS = settings.TASK_WORKER_THREADS
+TASK_POLL_INTERVAL = settings.TASK_POLL_INTERVAL
+TASK_MAX_ATTEMPTS = settings.TASK_MAX_ATTEMPTS
+TASK_RETRY_BACKOFF_SECONDS = settings.TASK_RETRY_BACKOFF_SECONDS
+TASK_RETRY_MAX_BACKOFF_SECONDS = settings.TASK_RETRY_MAX_BACKOFF_SECONDS
+TASK_LEASE_SECONDS = settings.TASK_LEASE_SECONDS
+
 # Logging configuration
+# todo.logs.configure applies LOGGING and then puts the handlers behind a
+# QueueHandler/QueueListener pair, so requests never wait on log I/O.
+LOGGING_CONFIG = 'todo.logs.configure'
+
+# Bearer token required to scrape /metrics (empty: no check, keep it internal)
+METRICS_TOKEN = settings.METRICS_TOKEN
+
+# Structured request log (todo.middleware.RequestLoggingMiddleware)
+REQUEST_LOG_SAMPLE_RATE = settings.REQUEST_LOG_SAMPLE_RATE
+REQUEST_LOG_SLOW_MS = settings.REQUEST_LOG_SLOW_MS
+REQUEST_LOG_CAPTURE_BODY = settings.REQUEST_LOG_CAPTURE_BODY
+REQUEST_LOG_BODY_MAX_BYTES = settings.REQUEST_LOG_BODY_MAX_BYTES
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -219,6 +356,9 @@ LOGGING = {
             'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'todo.logs.JsonFormatter',
+        },
     },
     'handlers': {
         'file': {
@@ -232,6 +372,11 @@ LOGGING = {
             'class': 'logging.StreamHandler',
             'formatter': 'verbose',
         },
+        'request_log': {
+            'level': 'INFO',
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+        },
     },
     'loggers': {
         'django': {
@@ -244,5 +389,10 @@ LOGGING = {
             'level': 'DEBUG',
             'propagate': True,
         },
+        'todo.requests': {
+            'handlers': ['request_log'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
 
@@ -19,6 +19,17 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_HOST: str = 'localhost'
     DB_PORT: str = ''
+    # Keep each worker's connection open between requests (seconds; 0 closes
+    # it after every request). Ignored with ASYNC_API, where Django can't
+    # reuse connections across requests safely.
+    DB_CONN_MAX_AGE: int = 60
+    DB_CONN_HEALTH_CHECKS: bool = True
+    # Streaming replicas for todo reads, as comma-separated host[:port];
+    # same name and credentials as the primary. After a write, the user's
+    # reads stay on the primary for DB_REPLICA_PIN_SECONDS (keep it above
+    # the worst replication lag).
+    DB_REPLICA_HOSTS: str = ''
+    DB_REPLICA_PIN_SECONDS: int = 5
     
     # Email settings
     EMAIL_BACKEND: str = 'django.core.mail.backends.console.EmailBackend'
@@ -41,7 +52,64 @@ class Settings(BaseSettings):
     SECURE_PROXY_SSL_HEADER_NAME: str = "HTTP_X_FORWARDED_PROTO"
     SECURE_PROXY_SSL_HEADER_VALUE: str = "https"
     
+    # Serve the todo API with async views (set when running ASGI workers)
+    ASYNC_API: bool = False
+    # Serve only /api/ and /metrics: no admin, sessions, messages, static
+    # files or HTML pages. Run migrate from a full (API_ONLY=False) process.
+    API_ONLY: bool = False
+    
+    # Request log settings
+    REQUEST_LOG_SAMPLE_RATE: float = 1.0
+    REQUEST_LOG_SLOW_MS: int = 1000
+    REQUEST_LOG_CAPTURE_BODY: bool = False
+    REQUEST_LOG_BODY_MAX_BYTES: int = 2048
+    
+    # Metrics settings
+    METRICS_TOKEN: str = ''
+    
+    # Cache settings
+    # The local-memory default is per process: with several gunicorn workers,
+    # point CACHE_BACKEND at a shared store (Redis, Memcached) so writes
+    # invalidate every worker's entries.
+    CACHE_BACKEND: str = 'django.core.cache.backends.locmem.LocMemCache'
+    CACHE_LOCATION: str = 'todo'
+    CACHE_MAX_ENTRIES: int = 10000
+    TODO_LIST_CACHE_TIMEOUT: int = 300
+    # Rendered todo cards are keyed on id and revision, so they never go
+    # stale; the timeout only bounds how long unused ones linger.
+    TODO_CARD_CACHE_TIMEOUT: int = 86400
+    
+    # Delta sync settings
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 30
+    
     # Authentication settings
+    # Trust the JWT user_id claim instead of loading the user on every API
+    # request; active/staff flags are cached for JWT_USER_STATE_TTL seconds.
+    JWT_STATELESS_AUTH: bool = False
+    JWT_USER_STATE_TTL: int = 60
+    
+    # Session settings
+    # db: a session row read (and sometimes written) on every HTML request.
+    # cached_db: reads come from the cache; use a shared CACHE_BACKEND, or a
+    # logout in one worker leaves the session alive in the others' caches.
+    # signed_cookies: no server-side state; sessions can't be revoked before
+    # they expire, except by a password change.
+    SESSION_MODE: Literal['db', 'cached_db', 'signed_cookies'] = 'db'
+    # Browsers silently drop cookies over ~4KB, which would log the user out.
+    SESSION_COOKIE_MAX_BYTES: int = 4000
+    
+    # Background task settings (todo.tasks, manage.py run_tasks)
+    # Run tasks in-process when the request's transaction commits instead of
+    # queueing them; for development without a worker.
+    TASKS_EAGER: bool = False
+    TASK_WORKER_THREADS: int = 4
+    TASK_POLL_INTERVAL: float = 1.0
+    TASK_MAX_ATTEMPTS: int = 5
+    TASK_RETRY_BACKOFF_SECONDS: float = 10.0
+    TASK_RETRY_MAX_BACKOFF_SECONDS: float = 3600.0
+    # A claimed task that hasn't finished within the lease is handed to
+    # another worker; keep it well above the slowest task.
+    TASK_LEASE_SECONDS: int = 600
     LOGIN_REDIRECT_URL: str = 'todo_list'
     LOGOUT_REDIRECT_URL: str = 'login'
     LOGIN_URL: str = 'login'
@@ -54,6 +122,10 @@ class Settings(BaseSettings):
     def csrf_trusted_origins(self) -> List[str]:
         return [origin.strip() for origin in self.CSRF_TRUSTED_ORIGINS.split(',')]
     
+    @property
+    def db_replica_hosts(self) -> List[str]:
+        return [host.strip() for host in self.DB_REPLICA_HOSTS.split(',') if host.strip()]
+    
     @property
     def cors_origin_whitelist(self) -> List[str]:
         if not self.CORS_ORIGIN_WHITELIST:
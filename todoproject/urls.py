@@ -14,16 +14,25 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from todo.metrics import metrics_view
 
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('', include('todo.urls')),
-    path('api/', include('todo.api.urls')),
-]
+if settings.API_ONLY:
+    urlpatterns = [
+        path('api/', include('todo.api.urls')),
+        path('metrics', metrics_view, name='metrics'),
+    ]
+else:
+    from django.contrib import admin
+
+    urlpatterns = [
+        path('admin/', admin.site.urls),
+        path('', include('todo.urls')),
+        path('api/', include('todo.api.urls')),
+        path('metrics', metrics_view, name='metrics'),
+    ]
 
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
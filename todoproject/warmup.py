@@ -0,0 +1,64 @@
+"""
+Work every worker would otherwise do lazily on its first requests: URLconf
+and view imports, DRF and simplejwt settings, serializer fields, model
+metadata and compiled templates.
+
+gunicorn.conf.py runs warm() in the master after the app is preloaded, so
+each forked worker, including every one recycled by max_requests, starts
+with all of it in copy-on-write memory. No database access.
+"""
+import time
+from django.apps import apps
+from django.conf import settings
+from django.urls import get_resolver, reverse
+
+TEMPLATES = (
+    'todo/todo_list.html', 'todo/todo_card.html', 'todo/todo_form.html',
+    'todo/todo_confirm_delete.html', 'todo/login.html', 'todo/signup.html',
+)
+
+
+def warm_urls():
+    resolver = get_resolver()
+    # Reversing fills the reverse lookup tables; resolving imports the views.
+    reverse('api-todo-list')
+    resolver.resolve('/api/todos/')
+    if not settings.API_ONLY:
+        resolver.resolve('/')
+
+
+def warm_api():
+    from rest_framework.settings import api_settings
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+    from todo.api.imports import TodoImportSerializer
+    from todo.api.serializers import TodoBulkOperationSerializer, TodoSerializer, UserSerializer
+
+    # Both import their classes from dotted paths on first access.
+    for name in ('DEFAULT_AUTHENTICATION_CLASSES', 'DEFAULT_PERMISSION_CLASSES',
+                 'DEFAULT_RENDERER_CLASSES', 'DEFAULT_PARSER_CLASSES'):
+        getattr(api_settings, name)
+    jwt_settings.AUTH_TOKEN_CLASSES
+    for serializer_class in (TodoSerializer, UserSerializer, TodoBulkOperationSerializer, TodoImportSerializer):
+        serializer_class().fields
+
+
+def warm_models():
+    for model in apps.get_models():
+        model._meta.get_fields()
+
+
+def warm_templates():
+    from django.template.loader import get_template
+    for name in TEMPLATES:
+        get_template(name)
+
+
+def warm():
+    """Run every warm-up step; returns the time it took in seconds."""
+    start = time.perf_counter()
+    warm_urls()
+    warm_api()
+    warm_models()
+    if not settings.API_ONLY:
+        warm_templates()
+    return time.perf_counter() - start